@@ -1,101 +1,225 @@
 import requests
-from PySide6.QtWidgets import QMessageBox
+
+from http_client import RENDER_READ_TIMEOUT, ApiClient
+from instrumentation import traced
 
 API_URL = "http://127.0.0.1:8000/"
+SONGS_PAGE_SIZE = 200
+SEARCH_PAGE_SIZE = 50
+
+# Shared pooled session: keep-alive, default timeouts and GET retries
+client = ApiClient()
+
+class ArtistExistsError(Exception):
+    pass
+
+class ResyncRequired(Exception):
+    # The server cannot describe changes since the given version; reload everything
+    pass
+
+def invalidate_cache(*resources: str):
+    # Drop cached GET responses for e.g. "artists" or "songs" after a mutation
+    for resource in resources:
+        client.invalidate(API_URL + resource)
 
+@traced("api")
+def get_artists():
+    # Like fetch_artists, but raises instead of returning [] when the backend is unreachable
+    return client.get_json(API_URL + "artists/")
+
+@traced("api")
 def fetch_artists():
     try:
-        response = requests.get(API_URL + "artists/")
-        response.raise_for_status()
-        return response.json()
+        return get_artists()
     except requests.RequestException:
         return []
 
+@traced("api")
 def fetch_songs(artist_id = None):
     try:
         query_params = f"?artists={artist_id}"
-        response = requests.get(API_URL + "songs/" + query_params)
-        response.raise_for_status()
-        return response.json()
+        return client.get_json(API_URL + "songs/" + query_params)
     except requests.RequestException:
         return []
 
-def fetch_song(song_id):
+def _json_or_none(response):
+    # Mutations answer with the stored record where the server sends one
     try:
-        query_params = f"?display=for_edit"
-        response = requests.get(API_URL + f"songs/{song_id}/" + query_params)
-        response.raise_for_status()
         return response.json()
-    except requests.RequestException as e:
-        QMessageBox.critical(None, "Error", f"Failed to fetch song: {e}")
+    except ValueError:
+        return None
+
+def _fetch_page(url: str, params: dict, limit: int, cursor = None, cached: bool = True):
+    # One page of a list endpoint. cursor is None for the first page, then either an
+    # offset (plain JSON list responses) or the server's opaque "next_cursor" string
+    page_params = dict(params, limit=limit)
+    if isinstance(cursor, str):
+        page_params["cursor"] = cursor
+    elif cursor:
+        page_params["offset"] = cursor
+
+    if cached:
+        data = client.get_json(url, params=page_params)
+    else:
+        response = client.get(url, params=page_params)
+        response.raise_for_status()
+        data = response.json()
+
+    if isinstance(data, dict):
+        return data.get("items", []), data.get("next_cursor")
+    # A full page may be followed by more; a longer one means paging was ignored
+    next_cursor = (cursor or 0) + len(data) if len(data) == limit else None
+    return data, next_cursor
+
+def _iter_pages(url: str, params: dict, page_size: int):
+    cursor = None
+    first_item = None
+    while True:
+        items, next_cursor = _fetch_page(url, params, page_size, cursor)
+        if items and cursor is not None and items[0] == first_item:
+            return  # server ignores offsets and repeats the first page
+        if items:
+            first_item = first_item or items[0]
+            yield items
+        if next_cursor is None:
+            return
+        cursor = next_cursor
 
+@traced("api")
+def fetch_songs_page(artist_id = None, cursor = None, limit: int = SONGS_PAGE_SIZE):
+    try:
+        query_params = f"?artists={artist_id}"
+        return _fetch_page(API_URL + "songs/" + query_params, {}, limit, cursor)
+    except requests.RequestException:
+        return [], None
+
+@traced("api")
+def iter_song_pages(artist_id = None, page_size: int = SONGS_PAGE_SIZE, display: str = None):
+    query_params = f"?artists={artist_id}"
+    params = {"display": display} if display else {}
+    yield from _iter_pages(API_URL + "songs/" + query_params, params, page_size)
+
+def iter_songs(artist_id = None, page_size: int = SONGS_PAGE_SIZE, display: str = None):
+    for page in iter_song_pages(artist_id, page_size, display):
+        yield from page
+
+@traced("api")
+def fetch_song(song_id):
+    query_params = f"?display=for_edit"
+    return client.get_json(API_URL + f"songs/{song_id}/" + query_params)
+
+@traced("api")
 def create_artist(name):
-    response = requests.post(API_URL + "artists", json={"name": name})
-    if response.status_code == 200:
-        QMessageBox.information(None, "Success", f"Artist '{name}' added.")
-    elif response.status_code == 400:
+    response = client.post(API_URL + "artists", json={"name": name})
+    invalidate_cache("artists")
+    if response.status_code == 400:
         detail = response.json().get("detail", "Unknown error")
-        QMessageBox.warning(None, "Already exists", detail)
-    else:
-        QMessageBox.critical(None, "Error", f"Failed to add artist: {response.text}")
+        raise ArtistExistsError(detail)
+    if response.status_code != 200:
+        raise Exception(f"Failed to add artist: {response.text}")
+    return response.json()
 
+@traced("api")
 def delete_artist(artist_id, artist_name):
-    try:
-        response = requests.delete(API_URL + f"artists/{artist_id}")
-        if response.status_code == 204:
-            QMessageBox.information(None, "Success", f"Artist '{artist_name}' was deleted.")
-        else:
-            QMessageBox.critical(
-                None,
-                "Error",
-                f"Failed to delete artist. Server responded with status {response.status_code}"
-            )
-    except Exception as e:
-        QMessageBox.critical(None, "Error", f"Failed to delete artist: {e}")
+    response = client.delete(API_URL + f"artists/{artist_id}")
+    invalidate_cache("artists", "songs")
+    if response.status_code != 204:
+        raise Exception(
+            f"Failed to delete artist '{artist_name}'. Server responded with status {response.status_code}"
+        )
 
+@traced("api")
 def export_songs_to_pdf(song_ids):
-    response = requests.post(
+    response = client.post(
         f"{API_URL}/songs/to_pdf",
         json={"song_ids": song_ids},
-        stream=True
+        stream=True,
+        timeout=(client.timeout[0], RENDER_READ_TIMEOUT)
     )
     if response.status_code != 200:
-        raise Exception(f"Failed to export PDF: {response.text}")
+        message = f"Failed to export PDF: {response.text}"
+        response.close()  # streamed: gives the connection back to the pool
+        raise Exception(message)
     return response
 
+@traced("api")
 def create_song(title: str, artist_id: int, lyrics: str):
-    response = requests.post(
+    response = client.post(
         f"{API_URL}/songs",
         json={"title": title, "artist_id": artist_id, "lyrics": lyrics}
     )
+    invalidate_cache("songs")
     if response.status_code != 200:
         raise Exception(f"Failed to create song: {response.text}")
+    return _json_or_none(response)
 
+@traced("api")
 def update_song(song_id: int, title: str, artist_id: int, lyrics: str):
-    response = requests.put(
+    response = client.put(
         f"{API_URL}/songs/{song_id}",
         json={"title": title, "artist_id": artist_id, "lyrics": lyrics}
     )
+    invalidate_cache("songs")
     if response.status_code != 200:
         raise Exception(f"Failed to update song: {response.text}")
+    return _json_or_none(response)
 
+@traced("api")
 def delete_songs(song_ids: list[int]):
-    response = requests.delete(
+    response = client.delete(
         f"{API_URL}/songs",
         json={"song_ids": song_ids}
     )
+    invalidate_cache("songs")
     if response.status_code != 204:
         raise Exception(response.text)
 
+@traced("api")
 def search_songs(query: str) -> list[dict]:
     params = {"search": query, "display": "short"}
-    response = requests.get(f"{API_URL}/songs", params=params)
+    response = client.get(f"{API_URL}/songs", params=params)
     if response.status_code != 200:
         raise Exception(response.text)
     return response.json()
 
+@traced("api")
+def fetch_search_page(query: str, cursor = None, limit: int = SEARCH_PAGE_SIZE):
+    # One page of hits; further pages are only asked for as the results are scrolled
+    params = {"search": query, "display": "short"}
+    return _fetch_page(f"{API_URL}/songs", params, limit, cursor, cached=False)
+
+# Delta sync protocol:
+#   GET changes/              -> {"version": V}  (current version, used as a baseline)
+#   GET changes/?since=V      -> {"version": V2,
+#                                 "artists": {"created": [...], "updated": [...], "deleted": [ids]},
+#                                 "songs": {"created": [...], "updated": [...], "deleted": [ids]}}
+# Created/updated songs use the display=for_edit shape (id, title, artist, lyrics).
+# 404 (no changes endpoint), 410 (V is unknown or too old) or {"resync": true}
+# raise ResyncRequired: the caller falls back to a full reload.
+@traced("api")
+def fetch_changes(since = None) -> dict:
+    params = {"since": since} if since is not None else {}
+    response = client.get(API_URL + "changes/", params=params)
+    if response.status_code in (404, 410):
+        raise ResyncRequired(f"Server cannot send changes since {since!r}")
+    response.raise_for_status()
+    data = response.json()
+    if data.get("resync"):
+        raise ResyncRequired(f"Server requested a full resync after {since!r}")
+
+    changes = {"version": data.get("version")}
+    for resource in ("artists", "songs"):
+        delta = data.get(resource) or {}
+        changes[resource] = {
+            "created": delta.get("created", []),
+            "updated": delta.get("updated", []),
+            "deleted": delta.get("deleted", []),
+        }
+    return changes
+
+@traced("api")
 def normalize_lyrics(text: str):
-    response = requests.post(
+    response = client.post(
         f"{API_URL}/songs/normalize",
         json={"lyrics": text}
     )
@@ -1,20 +1,112 @@
+import difflib
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import requests
-from PySide6.QtCore import Qt, Signal, QPoint, QObject, QEvent
-from PySide6.QtGui import QTextCharFormat, QColor, QFont, QTextFormat, QKeyEvent, QContextMenuEvent, QCursor
+from PySide6.QtCore import Qt, Signal, QPoint, QObject, QEvent, QConcatenateTablesProxyModel, QModelIndex, QTimer, QStandardPaths
+from PySide6.QtGui import (
+    QTextCharFormat, QColor, QFont, QKeyEvent, QContextMenuEvent, QCursor,
+    QStandardItemModel, QStandardItem, QSyntaxHighlighter, QTextCursor, QShortcut, QKeySequence
+)
 from PySide6.QtWidgets import (
     QWidget, QMainWindow, QPushButton, QLineEdit,
-    QVBoxLayout, QHBoxLayout, QListWidget, QTextEdit, QListWidgetItem,
-    QStackedWidget, QComboBox, QDialog, QLabel, QMessageBox, QCheckBox, QFileDialog, QApplication
+    QVBoxLayout, QHBoxLayout, QTextEdit,
+    QStackedWidget, QComboBox, QDialog, QLabel, QMessageBox, QCheckBox, QFileDialog, QApplication,
+    QListView, QStyledItemDelegate, QStyleOptionViewItem, QProgressDialog, QInputDialog
 )
 
 from api_calls import (
-    fetch_artists, fetch_songs, fetch_song, create_artist, delete_artist, export_songs_to_pdf,
-    create_song, update_song, delete_songs, search_songs, normalize_lyrics
+    fetch_artists, fetch_songs_page, fetch_song, create_artist, delete_artist,
+    create_song, update_song, delete_songs, fetch_search_page, normalize_lyrics, ArtistExistsError, SONGS_PAGE_SIZE,
+    SEARCH_PAGE_SIZE, invalidate_cache
 )
-
-CHORDS_PATTERN = r"\(([A-G][#b]?(?:m|maj|min|dim|aug|sus|add)?\d*(?:/[A-G][#b]?)?)\)"
+from artist_store import ArtistStore
+from catalog_snapshot import SNAPSHOT_FILE, load_snapshot, save_snapshot
+from catalog_sync import (
+    sync_catalog, current_version, has_changes, is_current, local_changes, patch_mirror, SongVersions
+)
+from chord_sheet import transpose_lyrics
+from chords import CHORDS_PATTERN, ChordSpanIndex
+from diagnostics import DiagnosticsPanel
+from instrumentation import traced
+from local_mirror import LocalMirror, VERSION_KEY, fetch_song_via_mirror
+from normalization import normalize_lyrics_local
+from pdf_cache import PdfCache, export_key
+from pdf_export import ExportProgress, stream_sharded_pdf_export
+from search_cache import SearchCache
+from search_results import SearchResultModel, SearchResultDelegate
+from song_list_model import SongListModel, SongSelection
+from startup_timing import startup
+from workers import RequestExecutor
+
+LOADING_MESSAGES = {
+    "artists": "Loading artists...",
+    "songs": "Loading songs...",
+    "song": "Loading song...",
+    "search": "Searching...",
+    "normalize": "Checking normalization with the server...",
+    "export": "Exporting PDF...",
+    "transpose": "Transposing songs...",
+    "catalog_sync": "Syncing catalog...",
+}
+
+SEARCH_DEBOUNCE_MS = 250
+NOTICE_MS = 5000  # how long status bar notices stay up
+TRANSPOSE_WORKERS = 4
+
+
+def export_selection(selection: SongSelection, save_path: str, pdf_cache: PdfCache,
+                     song_versions: SongVersions, version, mirror: LocalMirror = None):
+    # Runs on the export worker, which also resolves "all songs" to ids. The cache key is
+    # derived from the last sync; it is only trusted while the server has nothing newer
+    song_ids = selection.resolve(mirror)
+    if not song_ids:
+        raise Exception("There are no songs to export.")
+    versions = song_versions.versions(song_ids)
+    cache_key = export_key(versions) if versions is not None and is_current(version) else None
+    return stream_sharded_pdf_export(song_ids, save_path, pdf_cache, cache_key)
+
+
+def delete_selection(selection: SongSelection, mirror: LocalMirror = None) -> list[int]:
+    song_ids = selection.resolve(mirror)
+    delete_songs(song_ids)
+    return song_ids
+
+
+def transpose_songs(selection: SongSelection, semitones: int, artist_ids: dict, prefer: str = None,
+                    mirror: LocalMirror = None) -> dict:
+    """Fetch, transpose and save every selected song, a few at a time.
+
+    A failing song does not stop the others. The result lists the saved
+    songs under "updated", counts the songs without chords to move under
+    "unchanged" and keeps (song id, error) pairs under "failed".
+    """
+    def transpose_song(song_id):
+        song = fetch_song(song_id)
+        lyrics = transpose_lyrics(song["lyrics"], semitones, prefer)
+        if lyrics == song["lyrics"]:
+            return None
+        artist = song.get("artist") or {}
+        artist_id = artist.get("id") or artist_ids.get(artist.get("name"))
+        if artist_id is None:
+            raise Exception(f"Unknown artist '{artist.get('name', '')}'")
+        update_song(song_id, song["title"], artist_id, lyrics)
+        return dict(song, artist={"id": artist_id, "name": artist.get("name", "")}, lyrics=lyrics)
+
+    result = {"updated": [], "unchanged": 0, "failed": []}
+    with ThreadPoolExecutor(max_workers=TRANSPOSE_WORKERS) as pool:
+        futures = {pool.submit(transpose_song, song_id): song_id for song_id in selection.resolve(mirror)}
+        for future in as_completed(futures):
+            try:
+                song = future.result()
+            except Exception as e:
+                result["failed"].append((futures[future], e))
+                continue
+            if song is None:
+                result["unchanged"] += 1
+            else:
+                result["updated"].append(song)
+    return result
 
 
 class MainWindow(QMainWindow):
@@ -23,57 +115,231 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Chords Manager")
         self.setMinimumSize(800, 600)
 
+        self.executor = RequestExecutor(self)
+        self.executor.busy_changed.connect(self.on_request_busy_changed)
+
+        # One artist model shared by the artist list and the editor dropdown
+        self.artist_store = ArtistStore(self)
+
+        self.song_model = SongListModel(self)
+        self.song_model.page_requested.connect(self.fetch_songs_page)
+
+        self.search_cache = SearchCache()
+        self.search_results = []  # songs of the server search shown, cached once every page is in
+
+        # Optional offline copy of the catalog, read first and synced in the background
+        self.mirror = LocalMirror.from_env()
+
+        # Catalog version the lists reflect; refreshes only fetch what changed since
+        self.catalog_version = self.mirror.get_meta(VERSION_KEY) if self.mirror else None
+        self.catalog_sync_pending = False
+        self.mirror_patches = []  # local_changes deltas waiting for the sync in flight
+        self.failed_drafts = []  # (mode, song id, draft) of saves that failed while editing another song
+        self.song_versions = SongVersions(self.catalog_version)
+
+        cache_dir = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+
+        # Re-exports of an unchanged selection are served from disk
+        self.pdf_cache = PdfCache(os.path.join(cache_dir, "pdf_exports"))
+
         self.stack = QStackedWidget()
         self.setCentralWidget(self.stack)
 
         self.artist_song_screen = self.create_artist_song_screen()
-        self.editor_screen = self.create_editor_screen()
-
         self.stack.addWidget(self.artist_song_screen)
-        self.stack.addWidget(self.editor_screen)
-
         self.stack.setCurrentWidget(self.artist_song_screen)
+        self.song_model.placeholder_changed.connect(self.on_song_placeholder_changed)
+
+        # Built on first use, see ensure_editor_screen
+        self.editor_screen = None
+
+        # The last session's lists are shown right away; the network is first
+        # touched once the window is shown, see start_initial_load
+        self.snapshot_path = os.path.join(cache_dir, SNAPSHOT_FILE)
+        snapshot = load_snapshot(self.snapshot_path)
+        self.snapshot_songs = snapshot["songs"] if snapshot else []
+        if snapshot:
+            self.artist_store.set_artists(snapshot["artists"])
+            self.song_model.show_placeholder(snapshot["songs"])
+        self.initial_load_started = False
+
+        # Hidden diagnostics panel: span timings recorded by instrumentation.py
+        self.diagnostics_panel = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.toggle_diagnostics)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        startup.mark("first_paint")
+
+    def start_initial_load(self):
+        # Artists, the first song page and the catalog baseline, fetched concurrently.
+        # Queued by main.py right after show(), not on a paint: a window that starts
+        # hidden or minimized is never painted but must load all the same
+        if self.initial_load_started:
+            return
+        self.initial_load_started = True
+        self.load_artists()
+        self.load_songs()
+        if self.mirror:
+            self.sync_catalog()
+        else:
+            self.executor.submit(
+                "catalog_sync", current_version,
+                on_result=self.set_catalog_version,
+                on_error=self.on_catalog_sync_failed
+            )
 
-    def load_artists(self):
-        self.artist_list.clear()
+    def closeEvent(self, event):
+        self.save_snapshot()
+        super().closeEvent(event)
 
-        # add special All item
-        all_item = QListWidgetItem("All")
-        font = all_item.font()
-        font.setBold(True)
-        all_item.setFont(font)
-        self.artist_list.addItem(all_item)
+    def save_snapshot(self):
+        if not self.artist_store.is_loaded:
+            return
+        if self.song_model.artist_id is None and not self.song_model.is_placeholder():
+            self.snapshot_songs = self.song_model.songs(SONGS_PAGE_SIZE)
+        try:
+            save_snapshot(self.snapshot_path, self.artist_store.artists(), self.snapshot_songs)
+        except OSError:
+            pass  # only a head start for the next launch
+
+    def on_request_busy_changed(self, kind: str, busy: bool):
+        if kind == "export":
+            self.export_song_btn.setEnabled(not busy)
+        elif kind == "transpose":
+            self.transpose_songs_btn.setEnabled(not busy)
+
+        # Notices such as "Song updated." stay up until their timeout, even over loading messages
+        busy_kinds = [k for k in LOADING_MESSAGES if self.executor.is_busy(k)]
+        showing_loading = self.statusBar().currentMessage() in LOADING_MESSAGES.values()
+        if busy_kinds and (showing_loading or not self.statusBar().currentMessage()):
+            self.statusBar().showMessage(LOADING_MESSAGES[busy_kinds[-1]])
+        elif not busy_kinds and showing_loading:
+            self.statusBar().clearMessage()
+
+    def toggle_diagnostics(self):
+        if self.diagnostics_panel is None:
+            self.diagnostics_panel = DiagnosticsPanel(self)
+        self.diagnostics_panel.setVisible(not self.diagnostics_panel.isVisible())
+
+    def uses_mirror(self) -> bool:
+        return self.mirror is not None and self.mirror.is_populated()
+
+    def set_catalog_version(self, version):
+        self.catalog_version = version
+        self.song_versions.reset(version)
+        self.run_pending_catalog_sync()
+
+    def sync_catalog(self):
+        if self.executor.is_busy("catalog_sync"):
+            # Deltas are applied one at a time and in order; run again when this one is done
+            self.catalog_sync_pending = True
+            return
+        self.mirror_patches = []  # a sync started now already sees those mutations
+        self.executor.submit(
+            "catalog_sync", sync_catalog, self.catalog_version, self.mirror,
+            on_result=self.on_catalog_synced,
+            on_error=self.on_catalog_sync_failed
+        )
+
+    def on_catalog_synced(self, result: dict):
+        self.catalog_version = result["version"]
+        if result["full"]:
+            self.song_versions.reset(result["version"])
+            if self.mirror:
+                self.artist_store.set_artists(self.mirror.artists())
+            else:
+                self.load_artists()
+            self.load_songs(self.song_model.artist_id)
+        elif has_changes(result):
+            self.song_versions.apply_changes(result)
+            self.search_cache.clear()
+            self.artist_store.apply_changes(result["artists"])
+            self.song_model.apply_changes(result["songs"])
+        if not self.catalog_sync_pending:
+            self.song_versions.clear_dirty()  # this sync started after every local edit
+        self.run_pending_catalog_sync()
+
+    def on_catalog_sync_failed(self, error: Exception):
+        self.statusBar().showMessage(f"Working offline: {error}", NOTICE_MS)
+        self.run_pending_catalog_sync()
+
+    def run_pending_catalog_sync(self):
+        if self.catalog_sync_pending:
+            self.catalog_sync_pending = False
+            self.sync_catalog()
+        elif self.mirror_patches:
+            self.apply_mirror_patches()
+
+    def refresh_after_mutation(self, changes: dict = None):
+        if changes is not None and self.catalog_version is None and self.uses_mirror():
+            # No changes endpoint to ask: patch the mirror from the mutation's own result
+            # instead of downloading the whole catalog again
+            self.mirror_patches.append(changes)
+            if not self.executor.is_busy("catalog_sync"):
+                self.apply_mirror_patches()
+            return
+        self.sync_catalog()  # applies only what changed, or reloads the lists as a fallback
+
+    def apply_mirror_patches(self):
+        # On the catalog_sync kind, so a patch never races a full download into the mirror
+        patches, self.mirror_patches = self.mirror_patches, []
+        self.executor.submit(
+            "catalog_sync", patch_mirror, self.mirror, patches,
+            on_result=self.on_mirror_patched,
+            on_error=self.on_mirror_patch_failed
+        )
+
+    def on_mirror_patched(self, patches: list[dict]):
+        for changes in patches:
+            self.artist_store.apply_changes(changes["artists"])
+            self.song_model.apply_changes(changes["songs"])
+        self.run_pending_catalog_sync()
+
+    def on_mirror_patch_failed(self, error: Exception):
+        self.sync_catalog()  # the mirror may be missing a mutation; download it again
+
+    def load_artists(self):
+        if self.uses_mirror():
+            self.on_artists_loaded(self.mirror.artists())
+            return
+        self.executor.submit("artists", fetch_artists, on_result=self.on_artists_loaded)
 
-        for artist in fetch_artists():
-            item = QListWidgetItem(f"    {artist["name"]}")
-            item.setData(Qt.UserRole, artist["id"])
-            self.artist_list.addItem(item)
+    def on_artists_loaded(self, artists: list[dict]):
+        self.artist_store.set_artists(artists)
+        startup.mark("artists_loaded")
 
+    @traced("ui")
     def load_songs(self, artist_id = None):
-        self.song_list.clear()
-        for song in fetch_songs(artist_id):
-            item = QListWidgetItem(song["title"])
-            item.setData(Qt.UserRole, song["id"])
-            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
-            item.setCheckState(Qt.Unchecked)
-            self.song_list.addItem(item)
+        self.song_model.reset(artist_id)
+
+    def fetch_songs_page(self, artist_id, cursor, limit: int):
+        fetch_page = self.mirror.songs_page if self.uses_mirror() else fetch_songs_page
+        self.executor.submit(
+            "songs", fetch_page, artist_id, cursor, limit,
+            on_result=lambda page: self.on_songs_page(artist_id, cursor, page),
+            on_error=lambda e: self.song_model.page_failed()
+        )
+
+    def on_songs_page(self, artist_id, cursor, page: tuple):
+        self.song_model.append_page(*page, cursor)
+        if artist_id is None and cursor is None:
+            self.snapshot_songs = page[0]
+        startup.mark("songs_loaded")
+
+    def on_song_placeholder_changed(self, placeholder: bool):
+        # Snapshot rows may be stale: nothing is selected or changed until the real list is in
+        for widget in (self.select_all_songs_cb, self.del_song_btn, self.transpose_songs_btn,
+                       self.export_song_btn, self.del_artist_btn):
+            widget.setEnabled(not placeholder)
 
     def toggle_all_song_checkboxes(self, state):
-        for i in range(self.song_list.count()):
-            item = self.song_list.item(i)
-            item.setCheckState(Qt.Checked if state == Qt.Checked.value else Qt.Unchecked)
-
-    def get_checked_song_ids(self):
-        ids = []
-        for i in range(self.song_list.count()):
-            item = self.song_list.item(i)
-            if item.checkState() == Qt.Checked:
-                song_id = item.data(Qt.UserRole)
-                ids.append(song_id)
-        return ids
-
-    def on_artist_selected(self, item):
-        artist_id = item.data(Qt.UserRole)
+        # "Select All" means the whole list, including pages not scrolled to yet; it is
+        # kept as "all except the unchecked" and resolved to ids by the request using it
+        self.song_model.set_all_checked(state == Qt.Checked.value)
+
+    def on_artist_selected(self, index: QModelIndex):
+        artist_id = index.data(Qt.UserRole)
         self.load_songs(artist_id)
 
     def open_add_artist_dialog(self):
@@ -83,17 +349,35 @@ class MainWindow(QMainWindow):
             if not name:
                 QMessageBox.warning(self, "Input Error", "Artist name cannot be empty.")
                 return
-            create_artist(name)
-            self.load_artists()
+            self.executor.submit(
+                None, create_artist, name,
+                on_result=lambda artist: self.on_artist_created(name, artist),
+                on_error=self.on_create_artist_failed
+            )
+
+    def on_artist_created(self, name: str, artist: dict):
+        # Not added optimistically: rows, the editor dropdown and sync are keyed by the server's id
+        self.statusBar().showMessage(f"Artist '{name}' added.", NOTICE_MS)
+        if isinstance(artist, dict) and "id" in artist:
+            self.artist_store.add_artist(artist)
+            self.refresh_after_mutation(local_changes(artists={"created": [artist]}))
+        else:
+            self.refresh_after_mutation()
+
+    def on_create_artist_failed(self, error: Exception):
+        if isinstance(error, ArtistExistsError):
+            self.statusBar().showMessage(str(error), NOTICE_MS)
+        else:
+            self.statusBar().showMessage(f"Adding the artist failed: {error}", NOTICE_MS)
 
     def delete_selected_artist(self):
-        item = self.artist_list.currentItem()
-        if not item or item.text() == "All":
+        index = self.artist_list.currentIndex()
+        if not index.isValid() or index.data(Qt.UserRole) is None:
             QMessageBox.warning(self, "No Selection", "Please select an artist to delete (not 'All').")
             return
 
-        artist_name = item.text().strip()
-        artist_id = item.data(Qt.UserRole)
+        artist_name = index.data().strip()
+        artist_id = index.data(Qt.UserRole)
 
         confirm = QMessageBox.question(
             self,
@@ -104,47 +388,74 @@ class MainWindow(QMainWindow):
         if confirm != QMessageBox.Yes:
             return
 
-        delete_artist(artist_id, artist_name)
-        self.load_artists()
-        self.load_songs()
+        # Optimistic: the artist (and its songs, if listed) go now and come back if the server refuses
+        row = self.artist_store.row_of(artist_id)
+        artist = self.artist_store.artists()[row]
+        self.artist_store.remove_artist(artist_id)
+        generation = self.song_model.generation
+        removed_songs = []
+        if self.song_model.artist_id == artist_id:
+            removed_songs = self.song_model.remove_songs([song["id"] for song in self.song_model.songs()])
+
+        self.executor.submit(
+            None, delete_artist, artist_id, artist_name,
+            on_result=lambda _: self.on_artist_deleted(artist_id, artist_name),
+            on_error=lambda e: self.on_delete_artist_failed(e, row, artist, removed_songs, generation)
+        )
+
+    def on_artist_deleted(self, artist_id: int, artist_name: str):
+        self.statusBar().showMessage(f"Artist '{artist_name}' was deleted.", NOTICE_MS)
+        self.search_cache.clear()
+        self.refresh_after_mutation(local_changes(artists={"deleted": [artist_id]}))
+
+    def on_delete_artist_failed(self, error: Exception, row: int, artist: dict, removed_songs: list, generation: int):
+        self.artist_store.insert_artist(row, artist)
+        self.song_model.restore_songs(removed_songs, generation)
+        self.statusBar().showMessage(f"Deleting artist '{artist['name']}' failed: {error}", NOTICE_MS)
+
+    def ensure_editor_screen(self):
+        if self.editor_screen is None:
+            self.editor_screen = self.create_editor_screen()
+            self.stack.addWidget(self.editor_screen)
 
     def open_create_song_editor(self):
+        self.ensure_editor_screen()
+
         # Clear previous values
         self.title_input.setText("")
         self.lyrics_edit.setPlainText("")
         self.current_editing_song_id = None  # Custom attribute to track mode
         self.editor_save_mode = "create"
 
-        # Repopulate dropdown
-        self.artist_dropdown.clear()
-        artists = fetch_artists()
-        for artist in artists:
-            self.artist_dropdown.addItem(artist["name"], artist["id"])
         # Optional: reset artist dropdown to default (first index)
         self.artist_dropdown.setCurrentIndex(0)
 
         # Switch to editor screen
         self.stack.setCurrentWidget(self.editor_screen)
 
-    def load_song_into_editor(self, item: QListWidgetItem):
-        song_id = item.data(Qt.UserRole)
+    def load_song_into_editor(self, index: QModelIndex):
+        song_id = index.data(Qt.UserRole)
 
-        song = fetch_song(song_id)
+        fetch = (lambda: fetch_song_via_mirror(self.mirror, song_id)) if self.mirror else (lambda: fetch_song(song_id))
+        self.executor.submit(
+            "song", fetch,
+            on_result=lambda song: self.open_song_in_editor(song_id, song),
+            on_error=lambda e: QMessageBox.critical(self, "Error", f"Failed to fetch song: {e}")
+        )
+
+    def open_song_in_editor(self, song_id: int, song: dict):
+        self.ensure_editor_screen()
 
         # Fill editor fields
         self.title_input.setText(song["title"])
         self.lyrics_edit.setPlainText(song["lyrics"])
         self.highlight_chords()
 
-        # Repopulate dropdown
-        artists = fetch_artists()
-        self.artist_dropdown.clear()
-        for artist in artists:
-            self.artist_dropdown.addItem(artist["name"], artist["id"])
-
         # Set artist dropdown
-        artist_name = song["artist"]["name"]
-        index = self.artist_dropdown.findText(artist_name)
+        artist = song["artist"]
+        index = self.artist_dropdown.findData(artist.get("id"))
+        if index < 0:
+            index = self.artist_dropdown.findText(artist["name"])
         if index >= 0:
             self.artist_dropdown.setCurrentIndex(index)
 
@@ -155,79 +466,144 @@ class MainWindow(QMainWindow):
         # Switch to editor screen
         self.stack.setCurrentWidget(self.editor_screen)
 
+    @traced("ui")
     def highlight_chords(self, selected_pos: int = None):
-        text = self.lyrics_edit.toPlainText()
-
-        # Save cursor position if not explicitly set
-        current_pos = self.lyrics_edit.textCursor().position() if selected_pos is None else selected_pos
-
-        self.lyrics_edit.clear()
-        cursor = self.lyrics_edit.textCursor()
-        pattern = re.compile(CHORDS_PATTERN)
-
-        pos = 0
-        for match in pattern.finditer(text):
-            start, end = match.span()
-
-            # Insert normal text with default format
-            normal_format = QTextCharFormat()
-            cursor.insertText(text[pos:start], normal_format)
-
-            # Insert chord with special format
-            chord_format = QTextCharFormat()
-            if selected_pos is not None and start < selected_pos <= end:
-                chord_format.setForeground(QColor("#FFA500"))  # orange
-            else:
-                chord_format.setForeground(QColor("#aa4444"))  # dull red
-            chord_format.setFontWeight(QFont.Bold)
-            chord_format.setProperty(QTextFormat.UserProperty, "chord")
-
-            cursor.insertText(match.group(), chord_format)
-            pos = end
-
-        # Insert any remaining normal text at the end
-        normal_format = QTextCharFormat()
-        cursor.insertText(text[pos:], normal_format)
-
-        new_cursor = self.lyrics_edit.textCursor()
-        new_cursor.setPosition(current_pos)
-        self.lyrics_edit.setTextCursor(new_cursor)
+        # Chords are formatted by the editor's syntax highlighter as the text changes;
+        # this only moves the "selected chord" mark, re-highlighting the affected blocks
+        self.lyrics_edit.highlighter.select_chord_at(selected_pos)
 
     def go_back(self):
         self.stack.setCurrentIndex(0)
 
     def export_selected_songs(self):
-        selected_song_ids = self.get_checked_song_ids()
+        selection = self.song_model.selection()
 
-        if not selected_song_ids:
+        if not selection:
             QMessageBox.warning(self, "No Songs Selected", "Please select at least one song to export.")
             return
 
-        try:
-            response = export_songs_to_pdf(selected_song_ids)
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, "Save PDF", "exported_songs.pdf", "PDF files (*.pdf)"
+        )
+        if not save_path:
+            return
+
+        self.export_progress = QProgressDialog(
+            f"Exporting {selection.describe()}...", "Cancel", 0, 0, self
+        )
+        self.export_progress.setWindowTitle("Export")
+        self.export_progress.setMinimumDuration(500)
+        self.export_progress.setAutoClose(False)
+        self.export_progress.setAutoReset(False)
+        self.export_progress.canceled.connect(self.cancel_export)
+        self.export_progress.setValue(0)
+
+        self.executor.submit_stream(
+            "export", export_selection, selection, save_path, self.pdf_cache, self.song_versions.copy(),
+            self.catalog_version, self.mirror,
+            on_item=self.on_export_progress,
+            on_result=lambda _: self.on_export_finished(),
+            on_error=self.on_export_failed
+        )
+
+    def on_export_progress(self, progress: ExportProgress):
+        # QProgressDialog takes an int, so bytes are counted in kilobytes; a maximum
+        # of 0 shows a busy bar while there is nothing to measure
+        count = progress.songs_total
+        megabytes = progress.bytes_done / (1024 * 1024)
+        if progress.phase == "rendering" and not progress.songs_done:
+            self.export_progress.setMaximum(0)
+            label = f"The server is rendering {count} song(s); the download starts when it is done"
+        elif progress.phase == "rendering":
+            # Sharded export: the bar counts songs in finished shards
+            self.export_progress.setMaximum(count)
+            self.export_progress.setValue(progress.songs_done)
+            label = f"Rendered {progress.songs_done} of {count} song(s): {megabytes:.1f} MB"
+        elif progress.phase == "merging":
+            self.export_progress.setMaximum(0)
+            label = f"Merging {count} song(s) into one PDF"
+        elif progress.bytes_total:
+            self.export_progress.setMaximum(max(progress.bytes_total // 1024, 1))
+            self.export_progress.setValue(progress.bytes_done // 1024)
+            label = (f"Downloading {count} song(s): "
+                     f"{megabytes:.1f} of {progress.bytes_total / (1024 * 1024):.1f} MB")
+        else:
+            self.export_progress.setMaximum(0)
+            label = f"Downloading {count} song(s): {megabytes:.1f} MB"
+        self.export_progress.setLabelText(label)
+
+    def cancel_export(self):
+        # Also emitted when the dialog is closed; only a running export is cancelled
+        if self.executor.is_busy("export"):
+            self.executor.cancel("export")
+            self.statusBar().showMessage("Export cancelled.", NOTICE_MS)
+        self.export_progress.deleteLater()
+
+    def close_export_progress(self):
+        self.export_progress.canceled.disconnect(self.cancel_export)
+        self.export_progress.close()
+        self.export_progress.deleteLater()
+
+    def on_export_finished(self):
+        self.close_export_progress()
+        QMessageBox.information(self, "Success", "PDF saved successfully.")
+
+    def on_export_failed(self, error: Exception):
+        self.close_export_progress()
+        QMessageBox.critical(self, "Export Failed", str(error))
+
+    def transpose_selected_songs(self):
+        selection = self.song_model.selection()
+        if not selection:
+            QMessageBox.warning(self, "No Songs Selected", "Please select at least one song to transpose.")
+            return
+
+        semitones, ok = QInputDialog.getInt(
+            self, "Transpose", f"Transpose {selection.describe()} by semitones:", 2, -11, 11
+        )
+        if not ok or semitones == 0:
+            return
 
-            save_path, _ = QFileDialog.getSaveFileName(
-                self, "Save PDF", "exported_songs.pdf", "PDF files (*.pdf)"
+        artist_ids = {artist["name"]: artist["id"] for artist in self.artist_store.artists()}
+        # Unknown until the sync after the transpose reports them
+        if selection.everything:
+            self.song_versions.mark_all_dirty()
+        else:
+            self.song_versions.mark_dirty(selection.ids)
+        self.executor.submit(
+            "transpose", transpose_songs, selection, semitones, artist_ids, mirror=self.mirror,
+            on_result=self.on_songs_transposed,
+            on_error=self.on_transpose_failed
+        )
+
+    def on_songs_transposed(self, result: dict):
+        changed, failed = len(result["updated"]), result["failed"]
+        if failed:
+            song_id, error = failed[0]
+            QMessageBox.warning(
+                self, "Transpose Incomplete",
+                f"{changed} song(s) transposed, {len(failed)} failed.\nSong {song_id}: {error}"
             )
+        else:
+            QMessageBox.information(self, "Success", f"{changed} song(s) transposed.")
+        self.search_cache.clear()
+        self.refresh_after_mutation(local_changes(songs={"updated": result["updated"]}))
 
-            if save_path:
-                with open(save_path, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                QMessageBox.information(self, "Success", "PDF saved successfully.")
-        except Exception as e:
-            QMessageBox.critical(self, "Export Failed", str(e))
+    def on_transpose_failed(self, error: Exception):
+        QMessageBox.critical(self, "Transpose Failed", str(error))
+        self.search_cache.clear()
+        self.refresh_after_mutation()  # some songs may have been saved before it failed
 
     def handle_delete_songs(self):
-        song_ids = self.get_checked_song_ids()
-        if not song_ids:
+        selection = self.song_model.selection()
+        if not selection:
             QMessageBox.information(self, "No Selection", "Please select songs to delete.")
             return
 
         confirm = QMessageBox.question(
             self,
             "Confirm Deletion",
-            f"Are you sure you want to delete {len(song_ids)} song(s)?",
+            f"Are you sure you want to delete {selection.describe()}?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No
         )
@@ -235,12 +611,28 @@ class MainWindow(QMainWindow):
         if confirm != QMessageBox.Yes:
             return
 
-        try:
-            delete_songs(song_ids)
-            QMessageBox.information(self, "Success", "Songs deleted successfully.")
-            self.load_songs()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to delete songs: {e}")
+        # Optimistic: the rows go now and are restored if the server refuses
+        generation = self.song_model.generation
+        removed = self.song_model.remove_songs(self.song_model.checked_loaded_ids())
+        self.executor.submit(
+            None, delete_selection, selection, self.mirror,
+            on_result=lambda song_ids: self.on_songs_deleted(song_ids, selection, removed, generation),
+            on_error=lambda e: self.on_delete_songs_failed(e, removed, generation)
+        )
+
+    def on_songs_deleted(self, song_ids: list[int], selection: SongSelection, removed: list, generation: int):
+        self.statusBar().showMessage(f"{len(song_ids)} song(s) deleted.", NOTICE_MS)
+        # No page fetched from here on may come from a response cached before the delete
+        invalidate_cache("songs")
+        if selection.everything:
+            self.select_all_songs_cb.setChecked(False)  # rows loaded later must not show as checked
+        self.song_model.confirm_removed(removed, song_ids, generation)
+        self.search_cache.clear()
+        self.refresh_after_mutation(local_changes(songs={"deleted": song_ids}))
+
+    def on_delete_songs_failed(self, error: Exception, removed: list, generation: int):
+        self.song_model.restore_songs(removed, generation)
+        self.statusBar().showMessage(f"Deleting songs failed: {error}", NOTICE_MS)
 
     def handle_save_song(self):
         title = self.title_input.text().strip()
@@ -257,106 +649,212 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", "Invalid artist selected.")
             return
 
-        try:
-            if self.editor_save_mode == "create":
-                create_song(title, artist_id, lyrics)
-                QMessageBox.information(self, "Success", "Song created successfully.")
-            elif self.editor_save_mode == "edit":
-                update_song(self.current_editing_song_id, title, artist_id, lyrics)
-                QMessageBox.information(self, "Success", "Song updated successfully.")
-            else:
-                raise Exception("Unknown editor mode.")
+        mode = self.editor_save_mode
+        song_id = self.current_editing_song_id
+        if mode == "create":
+            request = (create_song, title, artist_id, lyrics)
+        elif mode == "edit":
+            request = (update_song, song_id, title, artist_id, lyrics)
+        else:
+            QMessageBox.critical(self, "Error", "Unknown editor mode.")
+            return
 
-            self.load_songs()  # refresh song list
-            self.stack.setCurrentIndex(0)  # go back to main screen
+        # Optimistic: back to the list at once, showing the new title; the draft is
+        # kept so a failed save can reopen it in the editor
+        draft = {"title": title, "artist": {"id": artist_id, "name": artist_name}, "lyrics": lyrics}
+        previous_title = None
+        if mode == "edit":
+            previous_title = self.song_model.set_title(song_id, title)
+            self.song_versions.mark_dirty([song_id])  # until the sync after the save reports it
+        self.stack.setCurrentWidget(self.artist_song_screen)
+
+        self.executor.submit(
+            None, *request,
+            on_result=lambda song: self.on_song_saved(mode, song_id, draft, song),
+            on_error=lambda e: self.on_save_song_failed(e, mode, song_id, draft, previous_title)
+        )
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+    def on_song_saved(self, mode: str, song_id, draft: dict, song: dict):
+        self.statusBar().showMessage("Song created." if mode == "create" else "Song updated.", NOTICE_MS)
+        self.search_cache.clear()
+        # The draft fills in whatever the response leaves out, e.g. the lyrics
+        if isinstance(song, dict) and "id" in song:
+            song = dict(draft, **song)
+        else:
+            song = dict(draft, id=song_id) if mode == "edit" else None
+        if song is None:
+            self.refresh_after_mutation()  # created, but without an id to show it by
+            return
+        if mode == "create":
+            # Shown now where the list is fully loaded; the sync below confirms it
+            self.song_model.apply_changes({"created": [song], "updated": [], "deleted": []})
+        self.refresh_after_mutation(local_changes(songs={"created" if mode == "create" else "updated": [song]}))
+
+    def on_save_song_failed(self, error: Exception, mode: str, song_id, draft: dict, previous_title: str):
+        if previous_title is not None:
+            self.song_model.set_title(song_id, previous_title)
+        self.statusBar().showMessage(f"Saving '{draft['title']}' failed: {error}", NOTICE_MS)
+        if self.stack.currentWidget() is self.editor_screen or self.executor.is_busy("song"):
+            # Busy with (or opening) another song: don't overwrite it, keep the draft for "Restore Draft"
+            self.failed_drafts.append((mode, song_id, draft))
+            self.update_restore_draft_button()
+            return
+        self.open_draft(mode, song_id, draft)
+
+    def restore_failed_draft(self):
+        mode, song_id, draft = self.failed_drafts.pop(0)
+        self.update_restore_draft_button()
+        self.open_draft(mode, song_id, draft)
+
+    def update_restore_draft_button(self):
+        self.restore_draft_btn.setText(f"Restore Draft ({len(self.failed_drafts)})")
+        self.restore_draft_btn.setVisible(bool(self.failed_drafts))
+
+    def open_draft(self, mode: str, song_id, draft: dict):
+        if mode == "create":
+            self.open_create_song_editor()
+            self.title_input.setText(draft["title"])
+            self.lyrics_edit.setPlainText(draft["lyrics"])
+            index = self.artist_dropdown.findData(draft["artist"]["id"])
+            if index >= 0:
+                self.artist_dropdown.setCurrentIndex(index)
+        else:
+            self.open_song_in_editor(song_id, draft)
+
+    def on_search_text_changed(self, text: str):
+        # Answer instantly from the cache where possible; the server is asked after the pause
+        self.search_timer.start()
+        query = text.strip()
+        if query:
+            cached, _ = self.search_cache.lookup(query)
+            if cached is None and self.uses_mirror():
+                cached = self.mirror.search(query)
+            if cached is not None:
+                self.populate_search_results(cached)
 
     def handle_search(self):
+        self.search_timer.stop()
         query = self.search_input.text().strip()
         if not query:
+            self.executor.cancel("search")
             self.search_results_dropdown.hide()
             return
 
-        try:
-            songs = search_songs(query)
-            self.populate_search_results(songs)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to perform search: {e}")
-            self.search_results_dropdown.hide()
+        cached, exact = self.search_cache.lookup(query)
+        if exact:
+            self.executor.cancel("search")
+            self.populate_search_results(cached)
+            return
+        if cached is None and self.uses_mirror():
+            cached = self.mirror.search(query)
+        if cached is not None:
+            # Results of a shorter query filtered locally, or the local mirror's
+            # answer, until the server confirms
+            self.populate_search_results(cached)
+        self.search_has_local_results = cached is not None
+        self.fetch_search_page(query, None, SEARCH_PAGE_SIZE)
+
+    def fetch_search_page(self, query: str, cursor, limit: int):
+        # Only the first page is fetched per search; the dropdown asks for the rest as it
+        # is scrolled. Submitting supersedes (and cancels) the previous search of the burst
+        self.executor.submit(
+            "search", fetch_search_page, query, cursor, limit,
+            on_result=lambda page: self.on_search_page(query, cursor, page),
+            on_error=lambda e: self.on_search_failed(cursor, e)
+        )
+
+    def on_search_page(self, query: str, cursor, page: tuple):
+        songs, next_cursor = page
+        if cursor is None:
+            self.search_results = list(songs)
+            self.populate_search_results(songs, query, next_cursor)
+        else:
+            self.search_results.extend(self.search_results_model.append_page(songs, next_cursor, query, cursor))
+            self.fit_search_results_height()
+        if self.search_results_model.query == query and self.search_results_model.is_complete():
+            self.search_cache.put(query, self.search_results)
+
+    def on_search_failed(self, cursor, error: Exception):
+        # Never modal: searches run while the user types
+        if cursor is not None:
+            self.search_results_model.page_failed()
+            self.statusBar().showMessage(f"Loading more results failed: {error}", NOTICE_MS)
+            return
+        if self.search_has_local_results and self.uses_mirror():
+            self.statusBar().showMessage("Server search failed, showing local results", NOTICE_MS)
+            return
+        self.statusBar().showMessage(f"Search failed: {error}", NOTICE_MS)
+        self.search_results_dropdown.hide()
 
-    def populate_search_results(self, songs: list[dict]):
-        self.search_results_dropdown.clear()
+    @traced("ui")
+    def populate_search_results(self, songs: list[dict], query: str = None, next_cursor=None):
+        # query and next_cursor: the first page of a server search, see SearchResultModel
         if not songs:
-            no_result_item = QListWidgetItem("No songs found")
-            no_result_item.setFlags(no_result_item.flags() & ~Qt.ItemIsSelectable)
-            no_result_item.setForeground(Qt.gray)
-            self.search_results_dropdown.addItem(no_result_item)
+            self.search_results_model.set_message("No songs found")
             self.search_results_dropdown.setFixedHeight(25)
             self.search_results_dropdown.show()
             return
-
-        for song in songs:
-            title = song.get("title", "Unknown Title")
-            artist_name = song.get("artist", {}).get("name", "Unknown Artist")
-
-            highlights = song.get("highlights", {})
-            highlight_text = ""
-            if highlights.get("title"):
-                highlight_text = highlights.get("title")[0]
-            elif highlights.get('artist'):
-                highlight_text = highlights.get("artist")[0]
-            elif highlights.get('lines'):
-                highlight_text = highlights.get("lines")[0]
-
-            item = QListWidgetItem()
-            item.setData(Qt.UserRole, song["id"])
-            self.search_results_dropdown.addItem(item)
-            widget = SearchResultItem(f"{title} - {artist_name}", highlight_text)
-            self.search_results_dropdown.setItemWidget(item, widget)
-
-            item.setSizeHint(widget.sizeHint())
-
+        self.search_results_model.set_songs(songs, query, next_cursor)
         self.search_results_dropdown.show()
+        self.fit_search_results_height()
 
+    def fit_search_results_height(self):
         # Adjust height based on number of items
         max_visible_items = 5  # max items to show before scrolling
-        item_count = len(songs)
+        item_count = self.search_results_model.rowCount()
         visible_count = min(item_count, max_visible_items)
 
-        # Calculate height needed (itemHeight * visibleCount + frame + scrollbar)
-        item_height = self.search_results_dropdown.sizeHintForRow(0) if self.search_results_dropdown.count() > 0 else 20
+        # Calculate height needed (itemHeight * visibleCount + frame + scrollbar);
+        # every row painted by the delegate has the same height
+        option = QStyleOptionViewItem()
+        option.initFrom(self.search_results_dropdown)
+        item_height = self.search_results_delegate.row_height(option)
         frame = self.search_results_dropdown.frameWidth() * 2
         scrollbar_height = self.search_results_dropdown.horizontalScrollBar().sizeHint().height()
 
         new_height = item_height * visible_count + frame + scrollbar_height
         self.search_results_dropdown.setFixedHeight(new_height)
 
-    def on_search_result_double_clicked(self, item: QListWidgetItem):
-        self.load_song_into_editor(item)
+    def on_search_result_double_clicked(self, index: QModelIndex):
+        if index.data(Qt.UserRole) is None:
+            return  # "No songs found" row
+        self.load_song_into_editor(index)
         self.search_results_dropdown.hide()
 
     def handle_normalize(self):
+        # Applied at once with the local rules; the server, which stays authoritative, checks
+        # the result in the background and a different answer is reported, not pasted over
         text = self.lyrics_edit.toPlainText()
+        lyrics = normalize_lyrics_local(text)
+        self.replace_lyrics(lyrics)
+        self.executor.submit(
+            "normalize", normalize_lyrics, text,
+            on_result=lambda server_lyrics: self.on_server_normalized(lyrics, server_lyrics),
+            on_error=lambda e: self.statusBar().showMessage(
+                f"Normalized with the local rules; the server could not check them: {e}", NOTICE_MS)
+        )
 
-        try:
-            normalized_lyrics = normalize_lyrics(text)
-
-            # Update editor with normalized text
-            self.lyrics_edit.setPlainText(normalized_lyrics)
-
-            cursor = self.lyrics_edit.textCursor()
-
-            default_format = QTextCharFormat()
-            cursor.setCharFormat(default_format)
-
-            self.lyrics_edit.setTextCursor(cursor)
-
-            self.highlight_chords()
-
-        except requests.RequestException as e:
-            QMessageBox.critical(self, "Normalization Failed", f"API call failed:\n{e}")
+    def on_server_normalized(self, lyrics: str, server_lyrics: str):
+        if server_lyrics == lyrics:
+            return
+        differing = sum(1 for line in difflib.ndiff(lyrics.splitlines(), server_lyrics.splitlines())
+                        if line.startswith("+ "))
+        self.statusBar().showMessage(
+            f"The server normalizes these lyrics differently ({differing} line(s)); kept the local result.",
+            NOTICE_MS)
+
+    def transpose_editor_lyrics(self, semitones: int):
+        prefer = self.accidentals_dropdown.currentData()
+        self.replace_lyrics(transpose_lyrics(self.lyrics_edit.toPlainText(), semitones, prefer))
+
+    def replace_lyrics(self, lyrics: str):
+        if lyrics == self.lyrics_edit.toPlainText():
+            return
+        # Replace the text as one edit, so Undo restores the previous lyrics
+        cursor = QTextCursor(self.lyrics_edit.document())
+        cursor.select(QTextCursor.Document)
+        cursor.insertText(lyrics)
+        self.highlight_chords()
 
     def create_artist_song_screen(self):
         widget = QWidget()
@@ -368,10 +866,24 @@ class MainWindow(QMainWindow):
         main_layout.addWidget(self.search_input)
         self.search_input.returnPressed.connect(self.handle_search)
 
-        self.search_results_dropdown = QListWidget()
+        # Search as you type once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.handle_search)
+        self.search_input.textChanged.connect(self.on_search_text_changed)
+
+        self.search_results_model = SearchResultModel(self)
+        self.search_results_model.page_requested.connect(self.fetch_search_page)
+        self.search_results_delegate = SearchResultDelegate(self)
+        self.search_results_dropdown = QListView()
+        self.search_results_dropdown.setUniformItemSizes(True)
+        self.search_results_dropdown.setEditTriggers(QListView.NoEditTriggers)
+        self.search_results_dropdown.setModel(self.search_results_model)
+        self.search_results_dropdown.setItemDelegate(self.search_results_delegate)
         self.search_results_dropdown.hide()  # hidden by default
         main_layout.addWidget(self.search_results_dropdown)
-        self.search_results_dropdown.itemDoubleClicked.connect(self.on_search_result_double_clicked)
+        self.search_results_dropdown.doubleClicked.connect(self.on_search_result_double_clicked)
         self.search_escape_filter = SearchInputEscapeFilter(self.search_input, self.search_results_dropdown)
         self.search_input.installEventFilter(self.search_escape_filter)
 
@@ -380,9 +892,24 @@ class MainWindow(QMainWindow):
 
         # Left block - Artist list
         left_layout = QVBoxLayout()
-        self.artist_list = QListWidget()
-        self.load_artists()
-        self.artist_list.itemDoubleClicked.connect(self.on_artist_selected)
+        # Special bold "All" row followed by the shared artist store
+        self.all_artists_model = QStandardItemModel(self)
+        all_item = QStandardItem("All")
+        all_item.setEditable(False)
+        font = all_item.font()
+        font.setBold(True)
+        all_item.setFont(font)
+        self.all_artists_model.appendRow(all_item)
+
+        self.artist_list_model = QConcatenateTablesProxyModel(self)
+        self.artist_list_model.addSourceModel(self.all_artists_model)
+        self.artist_list_model.addSourceModel(self.artist_store)
+
+        self.artist_list = QListView()
+        self.artist_list.setEditTriggers(QListView.NoEditTriggers)
+        self.artist_list.setModel(self.artist_list_model)
+        self.artist_list.setItemDelegate(ArtistListDelegate(self.artist_list))
+        self.artist_list.doubleClicked.connect(self.on_artist_selected)
         left_layout.addWidget(self.artist_list)
 
         artist_buttons = QHBoxLayout()
@@ -404,9 +931,11 @@ class MainWindow(QMainWindow):
         self.select_all_songs_cb.stateChanged.connect(self.toggle_all_song_checkboxes)
         right_layout.addWidget(self.select_all_songs_cb)
 
-        self.song_list = QListWidget()
-        self.load_songs()
-        self.song_list.itemDoubleClicked.connect(self.load_song_into_editor)
+        self.song_list = QListView()
+        self.song_list.setUniformItemSizes(True)
+        self.song_list.setEditTriggers(QListView.NoEditTriggers)
+        self.song_list.setModel(self.song_model)
+        self.song_list.doubleClicked.connect(self.load_song_into_editor)
         right_layout.addWidget(self.song_list)
 
         song_buttons = QHBoxLayout()
@@ -415,12 +944,19 @@ class MainWindow(QMainWindow):
         self.add_song_btn = QPushButton("+")
         self.del_song_btn = QPushButton("-")
         self.export_song_btn = QPushButton("Export")
+        self.transpose_songs_btn = QPushButton("Transpose")
+        self.restore_draft_btn = QPushButton("Restore Draft")
+        self.restore_draft_btn.setVisible(False)  # shown while saves that failed are waiting
+        song_buttons.insertWidget(0, self.restore_draft_btn)
         song_buttons.addWidget(self.add_song_btn)
         song_buttons.addWidget(self.del_song_btn)
+        song_buttons.addWidget(self.transpose_songs_btn)
         song_buttons.addWidget(self.export_song_btn)
         self.add_song_btn.clicked.connect(self.open_create_song_editor)
         self.del_song_btn.clicked.connect(self.handle_delete_songs)
+        self.transpose_songs_btn.clicked.connect(self.transpose_selected_songs)
         self.export_song_btn.clicked.connect(self.export_selected_songs)
+        self.restore_draft_btn.clicked.connect(self.restore_failed_draft)
         right_layout.addLayout(song_buttons)
 
         content_layout.addLayout(left_layout, 1)
@@ -438,11 +974,8 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.title_input)
 
         self.artist_dropdown = QComboBox()
+        self.artist_dropdown.setModel(self.artist_store)
         layout.addWidget(self.artist_dropdown)
-        # Populate dropdown
-        artists = fetch_artists()
-        for artist in artists:
-            self.artist_dropdown.addItem(artist["name"], artist["id"])
 
         self.lyrics_edit = ChordTextEdit(self)
         self.lyrics_edit.setPlaceholderText("Lyrics with chords in brackets...")
@@ -455,6 +988,17 @@ class MainWindow(QMainWindow):
         self.back_btn = QPushButton("Back")
         self.save_song_btn = QPushButton("Save")
         self.normalize_btn = QPushButton("Normalize")
+        self.accidentals_dropdown = QComboBox()
+        self.accidentals_dropdown.addItem("Keep #/b", None)
+        self.accidentals_dropdown.addItem("Sharps", "sharp")
+        self.accidentals_dropdown.addItem("Flats", "flat")
+        self.transpose_down_btn = QPushButton("-1")
+        self.transpose_up_btn = QPushButton("+1")
+        self.transpose_down_btn.setToolTip("Transpose chords down a semitone")
+        self.transpose_up_btn.setToolTip("Transpose chords up a semitone")
+        button_layout.addWidget(self.accidentals_dropdown)
+        button_layout.addWidget(self.transpose_down_btn)
+        button_layout.addWidget(self.transpose_up_btn)
         button_layout.addWidget(self.back_btn)
         button_layout.addWidget(self.save_song_btn)
         button_layout.addWidget(self.normalize_btn)
@@ -463,6 +1007,8 @@ class MainWindow(QMainWindow):
         self.back_btn.clicked.connect(self.go_back)
         self.save_song_btn.clicked.connect(self.handle_save_song)
         self.normalize_btn.clicked.connect(self.handle_normalize)
+        self.transpose_down_btn.clicked.connect(lambda: self.transpose_editor_lyrics(-1))
+        self.transpose_up_btn.clicked.connect(lambda: self.transpose_editor_lyrics(1))
 
         return widget
 
@@ -493,22 +1039,70 @@ class AddArtistDialog(QDialog):
     def get_name(self) -> str:
         return self.name_input.text().strip()
 
-class SearchResultItem(QWidget):
-    def __init__(self, title_artist: str, highlight_text: str):
-        super().__init__()
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(5, 2, 5, 8)
-        layout.setSpacing(1)
+class ArtistListDelegate(QStyledItemDelegate):
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        # Indent artists under the "All" row
+        if index.data(Qt.UserRole) is not None:
+            option.text = f"    {option.text}"
 
-        highlight_text = highlight_text.replace(
-            "<em>", '<em style="color: rgba(179, 87, 87, 0.7); font-style: italic;">'
-        )
-        self.label_main = QLabel(title_artist)
-        self.label_highlight = QLabel(highlight_text)
-        self.label_highlight.setStyleSheet("font-style: italic; color: gray;")
+class ChordHighlighter(QSyntaxHighlighter):
+    """Formats chords block by block as the document changes.
+
+    Qt only re-runs ``highlightBlock`` for blocks touched by an edit, and the
+    formats live in the layout rather than in the text, so highlighting never
+    rewrites the document or touches the undo stack. Chord positions come
+    from the editor's ChordSpanIndex.
+    """
+
+    def __init__(self, document, chord_index: ChordSpanIndex):
+        super().__init__(document)
+        self.chord_index = chord_index
+
+        self.chord_format = QTextCharFormat()
+        self.chord_format.setForeground(QColor("#aa4444"))  # dull red
+        self.chord_format.setFontWeight(QFont.Bold)
+
+        self.selected_chord_format = QTextCharFormat(self.chord_format)
+        self.selected_chord_format.setForeground(QColor("#FFA500"))  # orange
+
+        # Tracks the selected position through later edits
+        self._selected_cursor = None
+
+    def selected_position(self):
+        return None if self._selected_cursor is None else self._selected_cursor.position()
 
-        layout.addWidget(self.label_main)
-        layout.addWidget(self.label_highlight)
+    def select_chord_at(self, position: int = None):
+        document = self.document()
+        previous_block = None
+        if self._selected_cursor is not None:
+            previous_block = self._selected_cursor.block()
+
+        if position is None:
+            self._selected_cursor = None
+        else:
+            self._selected_cursor = QTextCursor(document)
+            self._selected_cursor.setPosition(min(position, document.characterCount() - 1))
+
+        if previous_block is not None and previous_block.isValid():
+            self.rehighlightBlock(previous_block)
+        if self._selected_cursor is not None:
+            block = self._selected_cursor.block()
+            if block != previous_block:
+                self.rehighlightBlock(block)
+
+    def highlightBlock(self, text: str):
+        selected = None
+        if self._selected_cursor is not None and self._selected_cursor.block() == self.currentBlock():
+            selected = self._selected_cursor.positionInBlock()
+
+        block_pos = self.currentBlock().position()
+        for start, end in self.chord_index.spans_between(block_pos, block_pos + len(text)):
+            start, end = start - block_pos, end - block_pos
+            if selected is not None and start < selected <= end:
+                self.setFormat(start, end - start, self.selected_chord_format)
+            else:
+                self.setFormat(start, end - start, self.chord_format)
 
 class ChordTextEdit(QTextEdit):
     def __init__(self, parent=None):
@@ -520,6 +1114,34 @@ class ChordTextEdit(QTextEdit):
         font = QFont("Arial", 16)
         self.setFont(font)
 
+        # The index must see each change before the highlighter does,
+        # so it is connected to contentsChange first
+        self.chord_index = ChordSpanIndex()
+        self.document().contentsChange.connect(self.update_chord_index)
+        self.highlighter = ChordHighlighter(self.document(), self.chord_index)
+
+    def update_chord_index(self, position: int, chars_removed: int, chars_added: int):
+        # Rescan only the lines touched by the change
+        document = self.document()
+        first_block = document.findBlock(position)
+        last_block = document.findBlock(position + chars_added)
+        if not last_block.isValid():
+            last_block = document.lastBlock()
+
+        lines = []
+        block = first_block
+        while True:
+            lines.append(block.text())
+            if block == last_block:
+                break
+            block = block.next()
+
+        region_start = first_block.position()
+        region_end = last_block.position() + last_block.length() - 1
+        old_region_end = region_end - chars_added + chars_removed
+        self.chord_index.replace_region(region_start, old_region_end, "\n".join(lines))
+
+    @traced("editor")
     def contextMenuEvent(self, event: QContextMenuEvent):
         if self.chord_input:
             self.chord_input.deleteLater()
@@ -576,9 +1198,9 @@ class ChordTextEdit(QTextEdit):
             self._chord_input_filter = None
 
         if re.fullmatch(CHORDS_PATTERN, f"({chord_text})"):
-            full_text = self.toPlainText()
-            new_text = full_text[:insert_pos] + f"({chord_text})" + full_text[insert_pos:]
-            self.setPlainText(new_text)
+            edit = QTextCursor(self.document())
+            edit.setPosition(insert_pos)
+            edit.insertText(f"({chord_text})")
 
             # Set chord as selected for further keyPressEvent control
             self.chord_selected = True
@@ -603,36 +1225,43 @@ class ChordTextEdit(QTextEdit):
             QApplication.instance().removeEventFilter(self._chord_input_filter)
             self._chord_input_filter = None
 
+    def move_chord(self, start: int, end: int, insert_pos: int) -> int:
+        # Move the chord at [start, end) to insert_pos (given in pre-move coordinates)
+        # as one undoable edit; returns the position just after the moved chord
+        edit = QTextCursor(self.document())
+        edit.beginEditBlock()
+        edit.setPosition(start)
+        edit.setPosition(end, QTextCursor.KeepAnchor)
+        chord = edit.selectedText()
+        edit.removeSelectedText()
+
+        if insert_pos > start:
+            insert_pos -= end - start
+        edit.setPosition(insert_pos)
+        edit.insertText(chord)
+        edit.endEditBlock()
+        return insert_pos + len(chord)
+
+    @traced("editor")
     def mousePressEvent(self, event):
         super().mousePressEvent(event)
 
         cursor = self.cursorForPosition(event.pos())
         pos = cursor.position()
-        text = self.toPlainText()
-
-        for match in re.finditer(CHORDS_PATTERN, text):
-            start, end = match.span()
-            if start <= pos <= end:
-                self.chord_selected = True
-                scrollbar = self.verticalScrollBar()
-                scroll_pos = scrollbar.value()
-                self.main_window.highlight_chords(selected_pos=pos)
-                scrollbar.setValue(scroll_pos)
-                return
+
+        if self.chord_index.span_at(pos):
+            self.chord_selected = True
+            self.main_window.highlight_chords(selected_pos=pos)
+            return
 
         self.chord_selected = False
-        scrollbar = self.verticalScrollBar()
-        scroll_pos = scrollbar.value()
         self.main_window.highlight_chords()
-        scrollbar.setValue(scroll_pos)
 
+    @traced("editor")
     def keyPressEvent(self, event: QKeyEvent):
         if event.key() in (Qt.Key_Up, Qt.Key_Down):
             self.chord_selected = False
-            scrollbar = self.verticalScrollBar()
-            scroll_pos = scrollbar.value()
             self.main_window.highlight_chords()
-            scrollbar.setValue(scroll_pos)
             super().keyPressEvent(event)
             return
 
@@ -642,73 +1271,47 @@ class ChordTextEdit(QTextEdit):
 
         cursor = self.textCursor()
         position = cursor.position()
-        text = self.toPlainText()
-
-        # Find all chord spans
-        for match in re.finditer(CHORDS_PATTERN, text):
-            start, end = match.span()
-            if start <= position <= end:
-                chord = match.group(0)
-
-                if event.key() == Qt.Key_Left and start > 0:
-                    insert_pos = start - 1
-
-                    # Check if we're about to insert into another chord
-                    for other in re.finditer(CHORDS_PATTERN, text):
-                        o_start, o_end = other.span()
-                        if o_start <= insert_pos < o_end:
-                            insert_pos = o_start  # jump just before the other chord
-                            break
-
-                    if insert_pos < 0:
-                        return  # Can't move further left
-
-                    new_text = text[:insert_pos] + chord + text[insert_pos:start] + text[end:]
-                    new_cursor_pos = insert_pos + len(chord)
-
-                    scrollbar = self.verticalScrollBar()
-                    scroll_pos = scrollbar.value()
-                    self.setPlainText(new_text)
-                    self.main_window.highlight_chords(selected_pos=new_cursor_pos)
-                    scrollbar.setValue(scroll_pos)
-                    cursor.setPosition(new_cursor_pos)
-                    self.setTextCursor(cursor)
-                    return
-
-                elif event.key() == Qt.Key_Right and end < len(text):
-                    insert_pos = end + 1  # try to move 1 char right
-
-                    # Check if we're moving into another chord
-                    for other in re.finditer(CHORDS_PATTERN, text):
-                        o_start, o_end = other.span()
-                        if o_start < insert_pos <= o_end:
-                            insert_pos = o_end  # jump just after the other chord
-                            break
-
-                    if insert_pos > len(text):
-                        return  # Can't move further right
-
-                    # Remove chord from current position
-                    new_text = text[:start] + text[end:]
-
-                    # Adjust insert_pos after removal
-                    adjusted_insert_pos = insert_pos - (end - start)
-
-                    # Insert chord at new position
-                    new_text = new_text[:adjusted_insert_pos] + chord + new_text[adjusted_insert_pos:]
-                    new_cursor_pos = adjusted_insert_pos + len(chord)
-
-                    # Maintain scroll and update
-                    scrollbar = self.verticalScrollBar()
-                    scroll_pos = scrollbar.value()
-                    self.setPlainText(new_text)
-                    self.main_window.highlight_chords(selected_pos=new_cursor_pos)
-                    scrollbar.setValue(scroll_pos)
-
-                    # Set cursor
-                    cursor.setPosition(new_cursor_pos)
-                    self.setTextCursor(cursor)
-                    return
+        text_length = self.document().characterCount() - 1
+
+        span = self.chord_index.span_at(position)
+        if span:
+            start, end = span
+
+            if event.key() == Qt.Key_Left and start > 0:
+                insert_pos = start - 1
+
+                # Check if we're about to insert into another chord
+                other = self.chord_index.span_covering(insert_pos)
+                if other:
+                    insert_pos = other[0]  # jump just before the other chord
+
+                if insert_pos < 0:
+                    return  # Can't move further left
+
+                new_cursor_pos = self.move_chord(start, end, insert_pos)
+                self.main_window.highlight_chords(selected_pos=new_cursor_pos)
+                cursor.setPosition(new_cursor_pos)
+                self.setTextCursor(cursor)
+                return
+
+            elif event.key() == Qt.Key_Right and end < text_length:
+                insert_pos = end + 1  # try to move 1 char right
+
+                # Check if we're moving into another chord
+                other = self.chord_index.span_reaching(insert_pos)
+                if other:
+                    insert_pos = other[1]  # jump just after the other chord
+
+                if insert_pos > text_length:
+                    return  # Can't move further right
+
+                new_cursor_pos = self.move_chord(start, end, insert_pos)
+                self.main_window.highlight_chords(selected_pos=new_cursor_pos)
+
+                # Set cursor
+                cursor.setPosition(new_cursor_pos)
+                self.setTextCursor(cursor)
+                return
 
         # Default behavior
         super().keyPressEvent(event)
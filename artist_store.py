@@ -0,0 +1,88 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+
+class ArtistStore(QAbstractListModel):
+    """Single in-memory list of artists shared by every artist view.
+
+    Backs both the artist list and the editor's artist dropdown, so the
+    catalog is fetched once and then kept current with row-level inserts and
+    removals instead of clearing and refilling widgets.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._artists = []
+        self._rows = {}  # artist id -> row
+        self.is_loaded = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._artists)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        artist = self._artists[index.row()]
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return artist["name"]
+        if role == Qt.UserRole:
+            return artist["id"]
+        return None
+
+    def artists(self) -> list[dict]:
+        return list(self._artists)
+
+    def row_of(self, artist_id) -> int:
+        return self._rows.get(artist_id, -1)
+
+    def set_artists(self, artists: list[dict]):
+        if self.is_loaded and list(artists) == self._artists:
+            return  # e.g. the fresh list matches the startup snapshot; keep the views as they are
+        self.beginResetModel()
+        self._artists = list(artists)
+        self._reindex()
+        self.is_loaded = True
+        self.endResetModel()
+
+    def add_artist(self, artist: dict):
+        if artist["id"] in self._rows:
+            return
+        row = len(self._artists)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._artists.append(artist)
+        self._rows[artist["id"]] = row
+        self.endInsertRows()
+
+    def insert_artist(self, row: int, artist: dict):
+        # Puts an artist back at its old row, e.g. when deleting it failed
+        if artist["id"] in self._rows:
+            return
+        row = min(row, len(self._artists))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._artists.insert(row, artist)
+        self._reindex()
+        self.endInsertRows()
+
+    def remove_artist(self, artist_id):
+        row = self.row_of(artist_id)
+        if row < 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._artists[row]
+        self._reindex()
+        self.endRemoveRows()
+
+    def apply_changes(self, delta: dict):
+        # "artists" part of an api_calls.fetch_changes delta
+        for artist in delta["created"] + delta["updated"]:
+            row = self.row_of(artist["id"])
+            if row < 0:
+                self.add_artist(artist)
+                continue
+            self._artists[row] = artist
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+        for artist_id in delta["deleted"]:
+            self.remove_artist(artist_id)
+
+    def _reindex(self):
+        self._rows = {artist["id"]: row for row, artist in enumerate(self._artists)}
@@ -0,0 +1,251 @@
+"""Bulk song import.
+
+    python bulk_import.py songs/            # *.txt files, one song each
+    python bulk_import.py songs.csv         # columns: title, artist, lyrics
+    python bulk_import.py songs.jsonl       # {"title": ..., "artist": ..., "lyrics": ...} per line
+
+A text file may start with "Title: ..." and "Artist: ..." header lines;
+otherwise its name is read as "Artist - Title.txt". Exits with status 1 if
+any song failed; the failures are listed at the end.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import api_calls
+from api_calls import ArtistExistsError, create_artist, create_song, get_artists
+from chords import CHORDS_RE
+
+IMPORT_WORKERS = 8
+PENDING_PER_WORKER = 4  # uploads queued ahead of the pool, bounds memory on huge inputs
+PROGRESS_INTERVAL = 1.0
+
+HEADER_RE = re.compile(r"^(title|artist)\s*:\s*(.*)$", re.IGNORECASE)
+# Parenthesised token that looks like it was meant as a chord: a root followed by chord
+# syntax, i.e. an accidental, a digit or slash, or a quality ending the token or running
+# into a number: "(H7)", "(Am7b5)", "(Hm)". Words such as "(Ah)", "(Hey)", "(Amen)" or
+# "(Chorus)" are lyrics and section labels, not chords.
+CHORD_LIKE_RE = re.compile(r"\(([A-H][^()\s]*)\)")
+CHORD_SYNTAX_RE = re.compile(r"[A-H](?:[#b]|(?:m|maj|min|dim|aug|sus|add)(?=[\d#/]|$)|.*[\d#/])")
+
+
+class ImportItem:
+    __slots__ = ("source", "title", "artist", "lyrics", "error")
+
+    def __init__(self, source: str, title: str = None, artist: str = None, lyrics: str = None, error: str = None):
+        self.source = source
+        self.title = title
+        self.artist = artist
+        self.lyrics = lyrics
+        self.error = error  # set when the input itself could not be read
+
+
+def read_text_song(path: str) -> ImportItem:
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    fields = {}
+    while lines and (match := HEADER_RE.match(lines[0].strip())):
+        fields[match.group(1).lower()] = match.group(2).strip()
+        lines.pop(0)
+    if "title" not in fields or "artist" not in fields:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        artist, sep, title = stem.partition(" - ")
+        if sep:
+            fields.setdefault("artist", artist.strip())
+            fields.setdefault("title", title.strip())
+    return ImportItem(path, fields.get("title"), fields.get("artist"), "\n".join(lines))
+
+
+def iter_text_dir(directory: str):
+    names = sorted(entry.name for entry in os.scandir(directory) if entry.name.lower().endswith(".txt"))
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            yield read_text_song(path)
+        except (OSError, UnicodeDecodeError) as e:
+            yield ImportItem(path, error=str(e))
+
+
+def iter_csv(path: str):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield ImportItem(f"{path}:{reader.line_num}", row.get("title"), row.get("artist"), row.get("lyrics"))
+
+
+def iter_jsonl(path: str):
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            source = f"{path}:{line_number}"
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield ImportItem(source, error=f"Invalid JSON: {e}")
+                continue
+            artist = record.get("artist")
+            if isinstance(artist, dict):
+                artist = artist.get("name")
+            yield ImportItem(source, record.get("title"), artist, record.get("lyrics"))
+
+
+def iter_items(path: str):
+    if os.path.isdir(path):
+        return iter_text_dir(path)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return iter_csv(path)
+    if extension in (".jsonl", ".ndjson"):
+        return iter_jsonl(path)
+    raise ValueError(f"Unsupported input '{path}': expected a directory, .csv or .jsonl file")
+
+
+def invalid_chords(lyrics: str) -> list[str]:
+    tokens = []
+    for match in CHORD_LIKE_RE.finditer(lyrics):
+        if CHORD_SYNTAX_RE.match(match.group(1)) and not CHORDS_RE.fullmatch(match.group(0)):
+            tokens.append(match.group(0))
+    return tokens
+
+
+def validate_item(item: ImportItem) -> str | None:
+    if item.error:
+        return item.error
+    missing = [name for name in ("title", "artist", "lyrics") if not (getattr(item, name) or "").strip()]
+    if missing:
+        return f"Missing {', '.join(missing)}"
+    bad_chords = invalid_chords(item.lyrics)
+    if bad_chords:
+        return f"Invalid chord(s): {', '.join(bad_chords[:5])}"
+    return None
+
+
+class ArtistResolver:
+    """Artist name -> id from a single fetch of the artist list.
+
+    Names are matched case-insensitively; an unknown artist is created the
+    first time it is needed and remembered, so concurrent uploads never
+    create it twice.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = {}
+        self._remember(get_artists())
+
+    def _remember(self, artists: list[dict]):
+        for artist in artists:
+            self._ids[artist["name"].strip().casefold()] = artist["id"]
+
+    def resolve(self, name: str):
+        key = name.strip().casefold()
+        with self._lock:
+            if key in self._ids:
+                return self._ids[key]
+            try:
+                artist = create_artist(name.strip())
+            except ArtistExistsError:
+                artist = None  # created by someone else meanwhile
+            if isinstance(artist, dict) and "id" in artist:
+                self._ids[key] = artist["id"]
+            else:
+                self._remember(get_artists())  # the response did not say which id it got
+            if key not in self._ids:
+                raise Exception(f"Artist '{name.strip()}' was not found after creating it")
+            return self._ids[key]
+
+
+def upload_item(resolver: ArtistResolver, item: ImportItem):
+    artist_id = resolver.resolve(item.artist)
+    create_song(item.title.strip(), artist_id, item.lyrics.strip())
+
+
+class ImportReport:
+    def __init__(self, out=sys.stderr):
+        self.out = out
+        self.imported = 0
+        self.errors = []  # (source, message)
+        self.started = time.monotonic()
+        self._last_progress = 0.0
+
+    def succeeded(self, item: ImportItem):
+        self.imported += 1
+        self.progress()
+
+    def failed(self, item: ImportItem, message: str):
+        self.errors.append((item.source, message))
+        self.progress()
+
+    def progress(self, force: bool = False):
+        now = time.monotonic()
+        if force or now - self._last_progress >= PROGRESS_INTERVAL:
+            self._last_progress = now
+            done = self.imported + len(self.errors)
+            rate = done / max(now - self.started, 1e-6)
+            print(f"{done} processed: {self.imported} ok, {len(self.errors)} failed ({rate:.0f}/s)", file=self.out)
+
+    def summary(self):
+        self.progress(force=True)
+        for source, message in self.errors:
+            print(f"  {source}: {message}", file=self.out)
+
+
+def run_import(items, workers: int = IMPORT_WORKERS, dry_run: bool = False,
+               report: ImportReport = None) -> ImportReport:
+    report = report or ImportReport()
+    resolver = None if dry_run else ArtistResolver()  # a dry run only validates, offline too
+    pending = {}  # future -> item
+
+    def collect(futures):
+        for future in futures:
+            item = pending.pop(future)
+            error = future.exception()
+            if error:
+                report.failed(item, str(error))
+            else:
+                report.succeeded(item)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for item in items:
+            problem = validate_item(item)
+            if problem:
+                report.failed(item, problem)
+                continue
+            if dry_run:
+                report.succeeded(item)
+                continue
+            pending[pool.submit(upload_item, resolver, item)] = item
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(wait(pending).done)
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import songs into the Chords API in bulk.")
+    parser.add_argument("path", help="directory of .txt files, or a .csv / .jsonl file")
+    parser.add_argument("--workers", type=int, default=IMPORT_WORKERS, help="concurrent uploads")
+    parser.add_argument("--dry-run", action="store_true", help="only validate; create nothing")
+    parser.add_argument("--api-url", default=api_calls.API_URL)
+    args = parser.parse_args()
+
+    api_calls.API_URL = args.api_url
+    try:
+        items = iter_items(args.path)
+    except ValueError as e:
+        parser.error(str(e))
+    report = run_import(items, max(args.workers, 1), args.dry_run)
+    report.summary()
+    sys.exit(1 if report.errors else 0)
+
+if __name__ == "__main__":
+    main()
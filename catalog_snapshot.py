@@ -0,0 +1,38 @@
+import json
+import os
+import tempfile
+
+SNAPSHOT_FILE = "catalog_snapshot.json"
+SNAPSHOT_FORMAT = 1
+
+
+def load_snapshot(path: str) -> dict | None:
+    """The artists and first song page saved by the last session, or None.
+
+    A missing, unreadable or foreign file is treated as no snapshot: it is
+    only ever a placeholder until the first fetches answer.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("format") != SNAPSHOT_FORMAT:
+        return None
+    if not isinstance(data.get("artists"), list) or not isinstance(data.get("songs"), list):
+        return None
+    return data
+
+
+def save_snapshot(path: str, artists: list[dict], songs: list[dict]):
+    # Written under a temporary name and renamed, so a crash never leaves half a file
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=".part", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"format": SNAPSHOT_FORMAT, "artists": artists, "songs": songs}, f)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -0,0 +1,154 @@
+from api_calls import fetch_changes, invalidate_cache, ResyncRequired
+from local_mirror import LocalMirror, VERSION_KEY, sync_mirror
+
+
+def has_changes(changes: dict) -> bool:
+    return any(changes[resource][kind] for resource in ("artists", "songs") for kind in changes[resource])
+
+
+def is_current(version) -> bool:
+    # Whether the server has changed nothing since ``version``; False when it cannot tell
+    try:
+        return not has_changes(fetch_changes(version))
+    except ResyncRequired:
+        return False
+
+
+def current_version():
+    # Baseline for later deltas; None when the server has no changes endpoint
+    try:
+        return fetch_changes()["version"]
+    except ResyncRequired:
+        return None
+
+
+def sync_catalog(since = None, mirror: LocalMirror = None) -> dict:
+    """Bring the client up to date with the server catalog; runs on a worker thread.
+
+    With a known ``since`` version only the changes after it are fetched and
+    applied to the mirror, and the delta is returned with ``full=False`` so
+    the caller can patch its in-memory models. With a mirror the delta also
+    lists, under "artist_songs", the songs of renamed or deleted artists.
+
+    Full-resync fallback: when there is no version yet, or the server answers
+    that it cannot describe changes since it (see ``fetch_changes``), the
+    current version is read first and then the whole catalog is downloaded
+    into the mirror. Changes made during that download are sent again by the
+    next delta, which is harmless as applying a delta is idempotent. The
+    result is ``{"version": ..., "full": True}`` and the caller reloads its
+    lists. A server without a changes endpoint always takes this path; the
+    client then only asks for it at startup or after a failed
+    ``patch_mirror``, and patches the mirror from its own mutations otherwise.
+    """
+    if since is not None:
+        try:
+            changes = fetch_changes(since)
+        except ResyncRequired:
+            pass
+        else:
+            if has_changes(changes):
+                invalidate_cache("artists", "songs")  # conditional-GET cache may predate the delta
+                if mirror:
+                    # Songs shown under a renamed or deleted artist, read before the delta drops them
+                    artists = changes["artists"]
+                    changes["artist_songs"] = [
+                        song_id for artist in artists["updated"] for song_id in mirror.artist_song_ids(artist["id"])
+                    ] + [song_id for artist_id in artists["deleted"] for song_id in mirror.artist_song_ids(artist_id)]
+                    mirror.apply_changes(changes)
+            elif mirror:
+                mirror.set_meta(VERSION_KEY, str(changes["version"]))
+            return dict(changes, full=False)
+
+    version = current_version()
+    invalidate_cache("artists", "songs")
+    if mirror:
+        sync_mirror(mirror)
+        if version is not None:
+            mirror.set_meta(VERSION_KEY, str(version))
+    return {"version": version, "full": True}
+
+
+def local_changes(artists: dict = None, songs: dict = None) -> dict:
+    """A delta in the ``fetch_changes`` shape describing one of our own mutations.
+
+    Built from the mutation's own result, e.g. ``local_changes(songs={"deleted": ids})``.
+    Its version is None: only the server assigns versions, so applying it to
+    the mirror leaves the stored version alone.
+    """
+    changes = {"version": None}
+    for resource, delta in (("artists", artists or {}), ("songs", songs or {})):
+        changes[resource] = {kind: list(delta.get(kind, [])) for kind in ("created", "updated", "deleted")}
+    return changes
+
+
+def patch_mirror(mirror: LocalMirror, patches: list[dict]) -> list[dict]:
+    # Runs on a worker thread. The songs of a deleted artist go with it in the
+    # mirror; they are added to the delta so the caller can drop their rows too
+    for changes in patches:
+        for artist_id in changes["artists"]["deleted"]:
+            changes["songs"]["deleted"] += mirror.artist_song_ids(artist_id)
+        mirror.apply_changes(changes)
+    return patches
+
+
+class SongVersions:
+    """Version token of every song, derived from the catalog versions.
+
+    A song's token is the catalog version at which a delta last reported it
+    changed, or the baseline (the version of the last full load) when it has
+    not changed since. So equal tokens mean equal content, which makes them
+    safe cache keys. Songs edited locally count as unknown until the next
+    sync reports their new version, and with no baseline (a server without a
+    changes endpoint) nothing is known.
+    """
+
+    def __init__(self, baseline = None):
+        self.baseline = baseline
+        self._changed = {}  # song id -> catalog version of its last change
+        self._dirty = set()
+        self._all_dirty = False
+
+    def reset(self, baseline):
+        # After a full load; local edits stay unknown until a sync started after them
+        self.baseline = baseline
+        self._changed = {}
+
+    def apply_changes(self, changes: dict):
+        # An artist's name is part of its songs' export, so renames and deletes change them too
+        artists = changes["artists"]
+        if artists["updated"] or artists["deleted"]:
+            if "artist_songs" in changes:
+                for song_id in changes["artist_songs"]:
+                    self._changed[song_id] = changes["version"]
+            else:
+                self._changed = {}  # which songs are theirs is not known: every token changes
+                self.baseline = changes["version"]
+        songs = changes["songs"]
+        for song in songs["created"] + songs["updated"]:
+            self._changed[song["id"]] = changes["version"]
+        for song_id in songs["deleted"]:
+            self._changed[song_id] = changes["version"]
+
+    def mark_dirty(self, song_ids):
+        self._dirty.update(song_ids)
+
+    def mark_all_dirty(self):
+        # An edit of a selection not resolved to ids yet, e.g. "all songs"
+        self._all_dirty = True
+
+    def clear_dirty(self):
+        self._dirty = set()
+        self._all_dirty = False
+
+    def copy(self):
+        # For a worker thread, which must not read the GUI thread's live sets
+        versions = SongVersions(self.baseline)
+        versions._changed = dict(self._changed)
+        versions._dirty = set(self._dirty)
+        versions._all_dirty = self._all_dirty
+        return versions
+
+    def versions(self, song_ids: list[int]) -> list[tuple[int, str]] | None:
+        if self.baseline is None or self._all_dirty or self._dirty.intersection(song_ids):
+            return None
+        return [(song_id, str(self._changed.get(song_id, self.baseline))) for song_id in song_ids]
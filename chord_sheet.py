@@ -0,0 +1,136 @@
+import re
+from array import array
+
+SHARP_NAMES = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+FLAT_NAMES = ("C", "Db", "D", "Eb", "E", "F", "Gb", "G", "Ab", "A", "Bb", "B")
+NATURAL_PITCHES = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+ACCIDENTALS = {"": 0, "#": 1, "b": -1}
+QUALITIES = ("", "m", "maj", "min", "dim", "aug", "sus", "add")
+NO_BASS = -1
+
+# chords.CHORDS_PATTERN with every part of the chord name captured separately
+CHORD_PARTS_RE = re.compile(
+    r"\(([A-G])([#b]?)(m|maj|min|dim|aug|sus|add)?(\d*)(?:/([A-G])([#b]?))?\)"
+)
+
+
+def pitch_of(letter: str, accidental: str) -> int:
+    return (NATURAL_PITCHES[letter] + ACCIDENTALS[accidental]) % 12
+
+
+def note_name(pitch: int, prefer: str) -> str:
+    return (FLAT_NAMES if prefer == "flat" else SHARP_NAMES)[pitch % 12]
+
+
+class Chord:
+    """One parsed chord token, e.g. "(F#m7/C#)" -> root 6, "#", "m", "7", bass 1."""
+
+    __slots__ = ("root", "accidental", "quality", "extension", "bass")
+
+    def __init__(self, root: int, accidental: str, quality: str, extension: str, bass: int = NO_BASS):
+        self.root = root
+        self.accidental = accidental  # as written; hints at the song's sharp/flat spelling
+        self.quality = quality
+        self.extension = extension
+        self.bass = bass
+
+    def name(self, semitones: int = 0, prefer: str = "sharp") -> str:
+        name = note_name(self.root + semitones, prefer) + self.quality + self.extension
+        if self.bass != NO_BASS:
+            name += "/" + note_name(self.bass + semitones, prefer)
+        return name
+
+
+class ChordSheet:
+    """Lyrics parsed once into lines and compact chord tokens.
+
+    Chords are stored column-wise in typed arrays: text span, root and bass
+    pitch classes (0-11, bass -1 when absent), the quality as an index into
+    QUALITIES and the extension as an index into ``extension_names``, which
+    keeps the digits exactly as written ("007" stays "007"; index 0 is no
+    extension). ``chord(i)`` materializes a Chord on demand. Transposition
+    renders a new text from the arrays without re-scanning the lyrics.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.line_starts = array("l", [0])
+        self.line_starts.extend(match.end() for match in re.finditer("\n", text))
+
+        self.starts = array("l")
+        self.ends = array("l")
+        self.roots = array("b")
+        self.accidentals = array("b")  # -1 flat, 0 natural, 1 sharp, as written
+        self.qualities = array("B")
+        self.extensions = array("l")
+        self.extension_names = [""]
+        extension_indexes = {"": 0}
+        self.basses = array("b")
+
+        for match in CHORD_PARTS_RE.finditer(text):
+            letter, accidental, quality, extension, bass_letter, bass_accidental = match.groups()
+            self.starts.append(match.start())
+            self.ends.append(match.end())
+            self.roots.append(pitch_of(letter, accidental))
+            self.accidentals.append(ACCIDENTALS[accidental])
+            self.qualities.append(QUALITIES.index(quality or ""))
+            index = extension_indexes.get(extension)
+            if index is None:
+                index = extension_indexes[extension] = len(self.extension_names)
+                self.extension_names.append(extension)
+            self.extensions.append(index)
+            self.basses.append(pitch_of(bass_letter, bass_accidental) if bass_letter else NO_BASS)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def line(self, number: int) -> str:
+        start = self.line_starts[number]
+        end = self.line_starts[number + 1] - 1 if number + 1 < len(self.line_starts) else len(self.text)
+        return self.text[start:end]
+
+    def chord(self, i: int) -> Chord:
+        return Chord(
+            self.roots[i],
+            "#" if self.accidentals[i] > 0 else "b" if self.accidentals[i] < 0 else "",
+            QUALITIES[self.qualities[i]],
+            self.extension_names[self.extensions[i]],
+            self.basses[i],
+        )
+
+    def preferred_accidental(self) -> str:
+        # The spelling the song already uses; sharps when it uses neither
+        return "flat" if sum(self.accidentals) < 0 else "sharp"
+
+    def transposed(self, semitones: int, prefer: str = None) -> str:
+        """The lyrics with every chord moved by ``semitones``.
+
+        ``prefer`` is "sharp" or "flat"; by default the song's own spelling
+        is kept. Chords written in a form CHORDS_PATTERN does not recognise
+        are left untouched, like any other text.
+        """
+        if not self.starts or semitones % 12 == 0 and prefer is None:
+            return self.text
+        names = FLAT_NAMES if (prefer or self.preferred_accidental()) == "flat" else SHARP_NAMES
+        rendered = {}  # songs repeat a handful of chords; render each once
+        parts = []
+        previous = 0
+        for i in range(len(self.starts)):
+            key = (self.roots[i], self.qualities[i], self.extensions[i], self.basses[i])
+            token = rendered.get(key)
+            if token is None:
+                root, quality, extension, bass = key
+                token = names[(root + semitones) % 12] + QUALITIES[quality] + self.extension_names[extension]
+                if bass != NO_BASS:
+                    token += "/" + names[(bass + semitones) % 12]
+                token = rendered[key] = f"({token})"
+            parts.append(self.text[previous:self.starts[i]])
+            parts.append(token)
+            previous = self.ends[i]
+        parts.append(self.text[previous:])
+        return "".join(parts)
+
+
+def transpose_lyrics(text: str, semitones: int, prefer: str = None) -> str:
+    return ChordSheet(text).transposed(semitones, prefer)
+
@@ -0,0 +1,115 @@
+import re
+from bisect import bisect_left, bisect_right
+
+CHORD_NAME_PATTERN = r"[A-G][#b]?(?:m|maj|min|dim|aug|sus|add)?\d*(?:/[A-G][#b]?)?"
+CHORDS_PATTERN = rf"\(({CHORD_NAME_PATTERN})\)"
+
+CHORD_NAME_RE = re.compile(CHORD_NAME_PATTERN)
+CHORDS_RE = re.compile(CHORDS_PATTERN)
+
+
+class ChordSpanIndex:
+    """Sorted (start, end) spans of every chord token in a text.
+
+    Lookups are bisections over the span starts. Chords never cross a line
+    break, so an edit only requires rescanning the lines it touched (see
+    ``replace_region``). The spans after an edit are not rewritten: they
+    carry one pending shift, from index ``_shift_from`` on, which the next
+    edit moves along. Typing in one place therefore costs the same however
+    many chords follow it.
+    """
+
+    def __init__(self, text: str = ""):
+        self._starts = []
+        self._ends = []
+        self._shift_from = 0
+        self._shift = 0
+        self.rebuild(text)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def rebuild(self, text: str):
+        self._starts = []
+        self._ends = []
+        self._shift_from = 0
+        self._shift = 0
+        for match in CHORDS_RE.finditer(text):
+            self._starts.append(match.start())
+            self._ends.append(match.end())
+
+    def replace_region(self, region_start: int, old_region_end: int, new_region_text: str):
+        # Old text [region_start, old_region_end] was replaced by new_region_text;
+        # both must cover whole lines so no chord crosses the region boundary
+        lo = self._bisect_left(region_start)
+        hi = self._bisect_right(old_region_end)
+        delta = region_start + len(new_region_text) - old_region_end
+
+        starts, ends = [], []
+        for match in CHORDS_RE.finditer(new_region_text):
+            starts.append(region_start + match.start())
+            ends.append(region_start + match.end())
+
+        # Move the pending shift's boundary to the edit: spans between the two
+        # take it now, so everything after the edit shares one shift again
+        shift_from, shift = self._shift_from, self._shift
+        if shift and shift_from < lo:
+            self._add(shift_from, lo, shift)
+        elif shift and shift_from > hi:
+            self._add(hi, shift_from, -shift)
+
+        self._starts[lo:hi] = starts
+        self._ends[lo:hi] = ends
+        self._shift_from = lo + len(starts)
+        self._shift = shift + delta
+
+    def _add(self, first: int, last: int, amount: int):
+        for i in range(first, last):
+            self._starts[i] += amount
+            self._ends[i] += amount
+
+    def _bisect_left(self, position: int) -> int:
+        # Stored starts before _shift_from are real positions, the rest are off by _shift
+        i = bisect_left(self._starts, position, 0, self._shift_from)
+        if i < self._shift_from:
+            return i
+        return bisect_left(self._starts, position - self._shift, self._shift_from)
+
+    def _bisect_right(self, position: int) -> int:
+        i = bisect_right(self._starts, position, 0, self._shift_from)
+        if i < self._shift_from:
+            return i
+        return bisect_right(self._starts, position - self._shift, self._shift_from)
+
+    def _span(self, i: int) -> tuple[int, int]:
+        shift = self._shift if i >= self._shift_from else 0
+        return self._starts[i] + shift, self._ends[i] + shift
+
+    def spans(self) -> list[tuple[int, int]]:
+        return [self._span(i) for i in range(len(self._starts))]
+
+    def spans_between(self, start: int, end: int) -> list[tuple[int, int]]:
+        return [self._span(i) for i in range(self._bisect_left(start), self._bisect_left(end))]
+
+    def span_at(self, position: int) -> tuple[int, int] | None:
+        # Chord with start <= position <= end; the left one wins between adjacent chords
+        i = self._bisect_right(position) - 1
+        if i > 0 and self._span(i - 1)[1] >= position:
+            i -= 1
+        if i >= 0 and self._span(i)[1] >= position:
+            return self._span(i)
+        return None
+
+    def span_covering(self, position: int) -> tuple[int, int] | None:
+        # Chord with start <= position < end
+        i = self._bisect_right(position) - 1
+        if i >= 0 and position < self._span(i)[1]:
+            return self._span(i)
+        return None
+
+    def span_reaching(self, position: int) -> tuple[int, int] | None:
+        # Chord with start < position <= end
+        i = self._bisect_left(position) - 1
+        if i >= 0 and position <= self._span(i)[1]:
+            return self._span(i)
+        return None
@@ -0,0 +1,86 @@
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox, QPushButton
+)
+
+from instrumentation import recorder
+
+REFRESH_MS = 1000
+COLUMNS = ("Span", "Count", "Errors", "p50 ms", "p90 ms", "p99 ms", "Max ms", "Statuses", "Requests", "Sent", "Received")
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024 or unit == "MiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class DiagnosticsPanel(QDialog):
+    """Rolling span percentiles from the instrumentation recorder, refreshed while visible."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.resize(900, 400)
+
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().hide()
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        self.record_cb = QCheckBox("Record")
+        self.record_cb.setChecked(recorder.enabled)
+        self.record_cb.toggled.connect(self.set_recording)
+        self.reset_btn = QPushButton("Reset")
+        self.reset_btn.clicked.connect(self.reset)
+        self.close_btn = QPushButton("Close")
+        self.close_btn.clicked.connect(self.hide)
+        button_layout.addWidget(self.record_cb)
+        button_layout.addStretch()
+        button_layout.addWidget(self.reset_btn)
+        button_layout.addWidget(self.close_btn)
+        layout.addLayout(button_layout)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.record_cb.setChecked(recorder.enabled)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def set_recording(self, enabled: bool):
+        recorder.enabled = enabled
+
+    def reset(self):
+        recorder.reset()
+        self.refresh()
+
+    def refresh(self):
+        rows = recorder.snapshot()
+        self.table.setRowCount(len(rows))
+        for row, stats in enumerate(rows):
+            statuses = ", ".join(f"{status}: {count}" for status, count in sorted(stats["statuses"].items()))
+            values = (
+                stats["name"], stats["count"], stats["errors"],
+                f"{stats['p50_ms']:.2f}", f"{stats['p90_ms']:.2f}", f"{stats['p99_ms']:.2f}", f"{stats['max_ms']:.2f}",
+                statuses, stats["requests"] or "",
+                format_bytes(stats["bytes_sent"]) if stats["requests"] else "",
+                format_bytes(stats["bytes_received"]) if stats["requests"] else "",
+            )
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(str(value))
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
@@ -0,0 +1,191 @@
+"""End-to-end client flows against the local stub API.
+
+    python e2e_benchmark.py                              # JSON report on stdout
+    python e2e_benchmark.py --latency 50 --songs 20000 --lyrics-size 8000
+    python e2e_benchmark.py --runs 5 -o run.json
+
+Starts stub_server in-process, points api_calls at it and drives a headless
+MainWindow through startup, opening a song, saving it, searching and
+deleting songs. For every flow it reports the number of requests, the bytes
+sent and received (as counted by the stub) and the wall time until the
+window has no request left in flight. Dialogs are answered automatically.
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtWidgets import QApplication, QMessageBox
+
+import api_calls
+from application import MainWindow
+from stub_server import DEFAULT_ARTISTS, DEFAULT_LYRICS_SIZE, DEFAULT_SONGS, Catalog, StubServer
+
+RUNS = 3
+SEARCH_QUERY = "heart"
+DELETE_COUNT = 5
+SETTLE_MS = 50  # idle this long before a flow counts as finished
+FLOW_TIMEOUT = 60.0
+
+
+class Dialogs:
+    # Stands in for the modal QMessageBox helpers: records messages, confirms questions
+    def __init__(self):
+        self.messages = []
+
+    def install(self):
+        for name in ("information", "warning", "critical"):
+            setattr(QMessageBox, name, staticmethod(lambda parent, title, text, *args, _name=name:
+                                                   self.record(_name, title, text)))
+        QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.Yes)
+
+    def record(self, level: str, title: str, text: str):
+        self.messages.append((level, title, text))
+        return QMessageBox.Ok
+
+    def take(self) -> list:
+        messages, self.messages = self.messages, []
+        return messages
+
+
+class FlowDriver:
+    def __init__(self, app: QApplication, server: StubServer, dialogs: Dialogs):
+        self.app = app
+        self.server = server
+        self.dialogs = dialogs
+        self.window = None
+
+    def settle(self, until=None):
+        # Pump the event loop until no request is in flight (and ``until`` holds) for SETTLE_MS
+        deadline = time.monotonic() + FLOW_TIMEOUT
+        idle_since = None
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            if self.window.executor.is_idle() and (until is None or until()):
+                idle_since = idle_since or time.monotonic()
+                if (time.monotonic() - idle_since) * 1000 >= SETTLE_MS:
+                    return
+            else:
+                idle_since = None
+            time.sleep(0.001)
+        raise TimeoutError("Flow did not settle")
+
+    def measure(self, name: str, action, until=None) -> dict:
+        self.server.reset_stats()
+        self.dialogs.take()
+        started = time.perf_counter()
+        action()
+        self.settle(until)
+        # The settle window itself is not part of the flow
+        wall_ms = (time.perf_counter() - started) * 1000 - SETTLE_MS
+        stats = self.server.stats
+        errors = [text for level, _, text in self.dialogs.take() if level != "information"]
+        return {
+            "flow": name,
+            "requests": stats["requests"],
+            "bytes_sent": stats["bytes_in"],
+            "bytes_received": stats["bytes_out"],
+            "wall_ms": round(wall_ms, 2),
+            "endpoints": dict(stats["by_endpoint"]),
+            "errors": errors,
+        }
+
+    def run(self) -> list[dict]:
+        results = [self.measure("startup", self.start_window,
+                                until=lambda: self.window.song_model.rowCount() > 0)]
+        window = self.window
+
+        results.append(self.measure("open_song", lambda: window.load_song_into_editor(window.song_model.index(0)),
+                                    until=lambda: window.stack.currentWidget() is window.editor_screen))
+
+        def save():
+            window.title_input.setText(window.title_input.text() + "!")
+            window.handle_save_song()
+        results.append(self.measure("save_song", save,
+                                    until=lambda: window.stack.currentWidget() is window.artist_song_screen))
+
+        def search():
+            window.search_input.setText(SEARCH_QUERY)
+            window.handle_search()
+        results.append(self.measure("search", search))
+
+        def delete():
+            for row in range(min(DELETE_COUNT, window.song_model.rowCount())):
+                window.song_model.setData(window.song_model.index(row), Qt.Checked, Qt.CheckStateRole)
+            window.handle_delete_songs()
+        results.append(self.measure("delete_songs", delete))
+
+        window.close()
+        window.deleteLater()
+        self.window = None
+        return results
+
+    def start_window(self):
+        self.window = MainWindow()
+        self.window.show()
+        QTimer.singleShot(0, self.window.start_initial_load)  # as main.py does
+
+
+def summarize(runs: list[list[dict]]) -> list[dict]:
+    summary = []
+    for flow_results in zip(*runs):
+        walls = sorted(result["wall_ms"] for result in flow_results)
+        summary.append({
+            "flow": flow_results[0]["flow"],
+            "requests": [result["requests"] for result in flow_results],
+            "bytes_received": [result["bytes_received"] for result in flow_results],
+            "median_wall_ms": walls[len(walls) // 2],
+        })
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure client flows against a local stub Chords API.")
+    parser.add_argument("-o", "--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--runs", type=int, default=RUNS, help="times to repeat every flow (the first is cold)")
+    parser.add_argument("--latency", type=float, default=0, help="added delay per response, in ms")
+    parser.add_argument("--artists", type=int, default=DEFAULT_ARTISTS)
+    parser.add_argument("--songs", type=int, default=DEFAULT_SONGS)
+    parser.add_argument("--lyrics-size", type=int, default=DEFAULT_LYRICS_SIZE, help="characters per song")
+    args = parser.parse_args()
+
+    catalog = Catalog(args.artists, args.songs, args.lyrics_size)
+    server = StubServer(catalog, latency_ms=args.latency).start()
+    api_calls.API_URL = server.url
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    app.setApplicationName("ChordsManagerBenchmark")  # own cache directory, e.g. the startup snapshot
+    dialogs = Dialogs()
+    dialogs.install()
+    driver = FlowDriver(app, server, dialogs)
+    runs = [driver.run() for _ in range(max(args.runs, 1))]
+    server.shutdown()
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency_ms": args.latency,
+            "artists": args.artists,
+            "songs": args.songs,
+            "lyrics_size": args.lyrics_size,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "summary": summarize(runs),
+        "runs": runs,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Editor micro-benchmarks on synthetic lyrics.
+
+    python editor_benchmark.py                          # JSON report on stdout
+    python editor_benchmark.py -o run.json
+    python editor_benchmark.py --compare baseline.json  # exit 1 on a p50 regression
+
+Runs headless (QT_QPA_PLATFORM defaults to offscreen). For every document
+size and chord density it drives the real ChordTextEdit paths: loading the
+text, highlight_chords, mousePressEvent on a chord, the Left/Right chord
+move in keyPressEvent and insert_chord, and reports latency percentiles in
+milliseconds.
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+import PySide6
+from PySide6.QtCore import QEvent, QPointF, Qt
+from PySide6.QtGui import QKeyEvent, QMouseEvent
+from PySide6.QtWidgets import QApplication, QVBoxLayout, QWidget
+
+from application import ChordTextEdit, MainWindow
+
+SIZES = (1024, 16 * 1024, 128 * 1024, 1024 * 1024)
+CHORDS_PER_LINE = (0.25, 1, 4)
+SAMPLES = 200
+LOAD_SAMPLES = 5
+REGRESSION_THRESHOLD = 1.25  # p50 slower than baseline by this factor fails --compare
+
+WORDS = ("love", "night", "road", "light", "heart", "home", "rain", "fire", "sky", "dream", "and", "the", "you")
+CHORDS = ("C", "G", "Am", "F", "Dm7", "E", "Bb", "F#m", "Gsus4", "C/E", "Ebmaj7", "A7")
+LINE_WIDTH = 40
+
+
+def generate_lyrics(size: int, chords_per_line: float, seed: int = 0) -> str:
+    # Lines of ~40 characters of words with chord tokens at random word boundaries
+    rng = random.Random(seed)
+    lines = []
+    length = 0
+    while length < size:
+        words = []
+        while sum(len(word) + 1 for word in words) < LINE_WIDTH:
+            words.append(rng.choice(WORDS))
+        chords = int(chords_per_line) + (rng.random() < chords_per_line % 1)
+        for _ in range(chords):
+            at = rng.randrange(len(words))
+            words[at] = f"({rng.choice(CHORDS)}){words[at]}"
+        line = " ".join(words)
+        if length and rng.random() < 0.1:
+            line = "\n" + line  # verse break
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)[:size]
+
+
+def percentiles(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+    return {
+        "samples": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 4),
+        "p50_ms": round(rank(50), 4),
+        "p90_ms": round(rank(90), 4),
+        "p99_ms": round(rank(99), 4),
+        "max_ms": round(ordered[-1], 4),
+    }
+
+
+def timed(fn, *args) -> float:
+    started = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - started) * 1000
+
+
+class EditorHost(QWidget):
+    # Just enough of MainWindow for ChordTextEdit: the real highlight_chords, no backend
+    highlight_chords = MainWindow.highlight_chords
+
+    def __init__(self):
+        super().__init__()
+        self.resize(900, 700)
+        layout = QVBoxLayout(self)
+        self.lyrics_edit = ChordTextEdit(self)
+        layout.addWidget(self.lyrics_edit)
+
+
+class EditorBenchmark:
+    def __init__(self, app: QApplication, samples: int = SAMPLES, seed: int = 0):
+        self.app = app
+        self.samples = samples
+        self.rng = random.Random(seed)
+        self.host = EditorHost()
+        self.host.show()
+        self.edit = self.host.lyrics_edit
+
+    def run(self, sizes=SIZES, densities=CHORDS_PER_LINE) -> list[dict]:
+        results = []
+        for size in sizes:
+            for density in densities:
+                text = generate_lyrics(size, density)
+                load = [timed(self.edit.setPlainText, text) for _ in range(LOAD_SAMPLES)]
+                chords = len(self.edit.chord_index)
+                context = {"size_bytes": size, "chords_per_line": density, "chords": chords}
+                results.append(dict(context, op="load", **percentiles(load)))
+
+                operations = [("insert_chord", self.sample_insert_chord)]
+                if chords:
+                    operations += [
+                        ("highlight_chords", self.sample_highlight),
+                        ("mouse_press_chord", self.sample_mouse_press),
+                        ("move_chord_right", lambda: self.sample_move(Qt.Key_Right)),
+                        ("move_chord_left", lambda: self.sample_move(Qt.Key_Left)),
+                    ]
+                for name, sample in operations:
+                    timings = [sample() for _ in range(self.samples)]
+                    results.append(dict(context, op=name, **percentiles(timings)))
+        return results
+
+    def random_chord(self) -> tuple[int, int]:
+        spans = self.edit.chord_index.spans()
+        return spans[self.rng.randrange(len(spans))]
+
+    def show_position(self, position: int):
+        cursor = self.edit.textCursor()
+        cursor.setPosition(position)
+        self.edit.setTextCursor(cursor)
+        self.edit.ensureCursorVisible()
+        self.app.processEvents()
+
+    def sample_highlight(self) -> float:
+        start, _ = self.random_chord()
+        return timed(lambda: self.host.highlight_chords(selected_pos=start + 1))
+
+    def sample_mouse_press(self) -> float:
+        start, _ = self.random_chord()
+        self.show_position(start + 1)
+        point = QPointF(self.edit.cursorRect().center())
+        event = QMouseEvent(
+            QEvent.MouseButtonPress, point, self.edit.viewport().mapToGlobal(point),
+            Qt.LeftButton, Qt.LeftButton, Qt.NoModifier
+        )
+        return timed(self.edit.mousePressEvent, event)
+
+    def sample_move(self, key) -> float:
+        start, _ = self.random_chord()
+        self.show_position(start + 1)
+        self.edit.chord_selected = True
+        elapsed = timed(self.edit.keyPressEvent, QKeyEvent(QEvent.KeyPress, key, Qt.NoModifier))
+        self.edit.undo()  # keep the document identical between samples
+        return elapsed
+
+    def sample_insert_chord(self) -> float:
+        position = self.rng.randrange(self.edit.document().characterCount())
+        elapsed = timed(self.edit.insert_chord, "Am7", position)
+        self.edit.undo()
+        return elapsed
+
+
+def compare(results: list[dict], baseline: dict, threshold: float) -> list[str]:
+    def key(result):
+        return result["op"], result["size_bytes"], result["chords_per_line"]
+
+    previous = {key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        before = previous.get(key(result))
+        if not before or not before["p50_ms"]:
+            continue
+        ratio = result["p50_ms"] / before["p50_ms"]
+        line = (f"{result['op']:<18} {result['size_bytes']:>8} B {result['chords_per_line']:>5}/line "
+                f"p50 {before['p50_ms']:.3f} -> {result['p50_ms']:.3f} ms ({ratio:.2f}x)")
+        print(line, file=sys.stderr)
+        if ratio > threshold:
+            regressions.append(line)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the lyrics editor on synthetic documents.")
+    parser.add_argument("-o", "--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--samples", type=int, default=SAMPLES, help="samples per operation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="document sizes in bytes")
+    parser.add_argument("--densities", type=float, nargs="+", default=list(CHORDS_PER_LINE), help="chords per line")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON report of an earlier run")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = EditorBenchmark(app, args.samples).run(args.sizes, args.densities)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "qt": PySide6.__version__,
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.threshold}x", file=sys.stderr)
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
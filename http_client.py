@@ -0,0 +1,132 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from instrumentation import recorder
+from response_cache import ResponseCache
+
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 30
+RENDER_READ_TIMEOUT = None  # e.g. to_pdf: no byte arrives before the server has rendered everything
+POOL_SIZE = 10
+GET_RETRIES = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (502, 503, 504)
+
+
+class Flight:
+    # One GET on the wire; identical get_json calls made meanwhile wait for its outcome
+    __slots__ = ("done", "data", "error", "invalidated")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.data = None
+        self.error = None
+        self.invalidated = False  # a mutation happened meanwhile: don't cache the result
+
+    def result(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.data
+
+
+class ApiClient(requests.Session):
+    """Shared HTTP session for the Chords API.
+
+    Keeps connections to the backend alive in a pool, applies a default
+    (connect, read) timeout to every request and retries idempotent GETs
+    with exponential backoff. Non-idempotent requests are only retried when
+    the connection could not be established at all. ``get_json`` adds a
+    conditional-GET response cache on top, and coalesces identical GETs:
+    while one is in flight, callers asking for the same URL share its
+    response (or error) instead of sending their own.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        pool_size: int = POOL_SIZE,
+        retries: int = GET_RETRIES,
+        backoff_factor: float = RETRY_BACKOFF,
+    ):
+        super().__init__()
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache = ResponseCache()
+        self._flights = {}  # url -> Flight
+        self._flights_lock = threading.Lock()
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        response = super().request(method, url, **kwargs)
+        if recorder.enabled:
+            recorder.annotate_response(response, streamed=kwargs.get("stream", False))
+        return response
+
+    def get_json(self, url: str, params: dict = None):
+        # Conditional GET through the response cache: fresh entries skip the network,
+        # stale ones are revalidated and a 304 reuses the already parsed body
+        key = requests.Request("GET", url, params=params).prepare().url
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_fresh(self.cache.ttl):
+            return entry.data
+
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leading = flight is None
+            if leading:
+                flight = self._flights[key] = Flight()
+        if not leading:
+            return flight.result()
+
+        try:
+            flight.data = self._revalidate(key, url, params, entry, flight)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+        return flight.data
+
+    def _revalidate(self, key: str, url: str, params: dict, entry, flight: Flight):
+        headers = entry.validators() if entry is not None else {}
+        response = self.get(url, params=params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(key)
+            return entry.data
+
+        response.raise_for_status()
+        data = response.json()
+        # Checked and stored under the lock invalidate() holds, so no mutation slips in between
+        with self._flights_lock:
+            if not flight.invalidated:
+                self.cache.put(key, data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return data
+
+    def invalidate(self, url_prefix: str = ""):
+        # GETs already on the wire may predate the mutation: later callers send their own,
+        # and their responses are flagged before the cache is emptied so none is stored after it
+        with self._flights_lock:
+            for key in [k for k in self._flights if k.startswith(url_prefix)]:
+                self._flights.pop(key).invalidated = True
+            self.cache.invalidate(url_prefix)
@@ -0,0 +1,245 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import Counter, deque
+
+INSTRUMENT_ENV = "CHORDS_INSTRUMENT"  # "1": record for the diagnostics panel
+JSONL_PATH_ENV = "CHORDS_TRACE_JSONL"  # also write every span as a JSON line
+CHROME_TRACE_PATH_ENV = "CHORDS_TRACE_CHROME"  # also write a chrome://tracing / Perfetto file
+ROLLING_WINDOW = 512  # durations kept per span name for percentiles
+
+
+class SpanStats:
+    __slots__ = ("count", "errors", "durations", "statuses", "requests", "bytes_sent", "bytes_received")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.durations = deque(maxlen=ROLLING_WINDOW)
+        self.statuses = Counter()
+        self.requests = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+
+class Span:
+    __slots__ = ("name", "start", "fields")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.fields = {}
+
+
+class JsonlSink:
+    def __init__(self, path: str):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, event: dict):
+        self.file.write(json.dumps(event) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class ChromeTraceSink:
+    # JSON Array Format: the closing "]" is optional, so a crashed session still loads
+    def __init__(self, path: str):
+        self.file = open(path, "w", encoding="utf-8")
+        self.file.write("[\n")
+        self.pid = os.getpid()
+
+    def write(self, event: dict):
+        trace_event = {
+            "name": event["name"],
+            "cat": event["name"].partition(".")[0],
+            "ph": "X",
+            "ts": round(event["ts"] * 1e6, 1),
+            "dur": round(event["duration_ms"] * 1000, 1),
+            "pid": self.pid,
+            "tid": event["thread"],
+            "args": {key: value for key, value in event.items() if key not in ("name", "ts", "duration_ms", "thread")},
+        }
+        self.file.write(json.dumps(trace_event) + ",\n")
+
+    def close(self):
+        self.file.write("{}]\n")
+        self.file.close()
+
+
+class Recorder:
+    """Collects spans: named, timed sections of code.
+
+    Spans are aggregated per name into rolling duration windows (for the
+    diagnostics panel's percentiles) plus counters for errors, HTTP status
+    codes and bytes, and optionally streamed to sinks. While ``enabled`` is
+    False the ``traced`` wrappers call straight through, so leaving the
+    instrumentation in costs one attribute check per call.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._stats = {}  # span name -> SpanStats
+        self._sinks = []
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+
+    @classmethod
+    def from_env(cls):
+        recorder = cls()
+        if os.environ.get(JSONL_PATH_ENV):
+            recorder.add_sink(JsonlSink(os.environ[JSONL_PATH_ENV]))
+        if os.environ.get(CHROME_TRACE_PATH_ENV):
+            recorder.add_sink(ChromeTraceSink(os.environ[CHROME_TRACE_PATH_ENV]))
+        recorder.enabled = bool(recorder._sinks) or os.environ.get(INSTRUMENT_ENV, "") not in ("", "0")
+        atexit.register(recorder.close)
+        return recorder
+
+    def add_sink(self, sink):
+        with self._lock:
+            self._sinks.append(sink)
+
+    def close(self):
+        with self._lock:
+            sinks, self._sinks = self._sinks, []
+        for sink in sinks:
+            sink.close()
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def begin(self, name: str) -> Span:
+        span = Span(name)
+        self._stack().append(span)
+        return span
+
+    def end(self, span: Span, error: BaseException = None):
+        duration_ms = (time.perf_counter() - span.start) * 1000
+        stack = self._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        fields = span.fields
+        if error is not None:
+            fields["error"] = f"{type(error).__name__}: {error}"
+
+        with self._lock:
+            stats = self._stats.get(span.name)
+            if stats is None:
+                stats = self._stats[span.name] = SpanStats()
+            stats.count += 1
+            stats.errors += error is not None
+            stats.durations.append(duration_ms)
+            if "status" in fields:
+                stats.statuses[fields["status"]] += 1
+            stats.requests += fields.get("requests", 0)
+            stats.bytes_sent += fields.get("bytes_sent", 0)
+            stats.bytes_received += fields.get("bytes_received", 0)
+            if self._sinks:
+                event = dict(fields, name=span.name, ts=span.start - self._origin,
+                             duration_ms=round(duration_ms, 3), thread=threading.get_ident())
+                for sink in self._sinks:
+                    sink.write(event)
+
+    def annotate_response(self, response, streamed: bool = False):
+        # Adds an HTTP exchange to the innermost span of this thread
+        stack = self._stack()
+        if not stack:
+            return
+        length = response.headers.get("Content-Length")
+        if length is None and not streamed:
+            length = len(response.content)
+        body = response.request.body or b""
+        fields = stack[-1].fields
+        fields["status"] = response.status_code
+        fields["requests"] = fields.get("requests", 0) + 1
+        fields["bytes_sent"] = fields.get("bytes_sent", 0) + len(body)
+        fields["bytes_received"] = fields.get("bytes_received", 0) + int(length or 0)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self) -> list[dict]:
+        """Per span name: count, errors, rolling p50/p90/p99/max in ms, statuses and bytes."""
+        with self._lock:
+            items = [(name, stats, sorted(stats.durations)) for name, stats in self._stats.items()]
+        rows = []
+        for name, stats, durations in sorted(items, key=lambda item: item[0]):
+            def rank(p):
+                return durations[min(len(durations) - 1, int(p / 100 * len(durations)))] if durations else 0.0
+            rows.append({
+                "name": name,
+                "count": stats.count,
+                "errors": stats.errors,
+                "p50_ms": rank(50),
+                "p90_ms": rank(90),
+                "p99_ms": rank(99),
+                "max_ms": durations[-1] if durations else 0.0,
+                "statuses": dict(stats.statuses),
+                "requests": stats.requests,
+                "bytes_sent": stats.bytes_sent,
+                "bytes_received": stats.bytes_received,
+            })
+        return rows
+
+
+recorder = Recorder.from_env()
+
+
+def traced(category: str):
+    """Decorator recording every call as a span named "<category>.<qualname>".
+
+    Generator functions get one span per resumption, i.e. per yielded chunk
+    such as a page of results.
+    """
+    def decorate(fn):
+        name = f"{category}.{fn.__qualname__}"
+
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not recorder.enabled:
+                    return fn(*args, **kwargs)
+                return _traced_chunks(name, fn(*args, **kwargs))
+            return wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not recorder.enabled:
+                return fn(*args, **kwargs)
+            span = recorder.begin(name)
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                recorder.end(span, e)
+                raise
+            recorder.end(span)
+            return result
+        return wrapper
+    return decorate
+
+
+def _traced_chunks(name: str, chunks):
+    try:
+        while True:
+            span = recorder.begin(name)
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                recorder.end(span)
+                return
+            except BaseException as e:
+                recorder.end(span, e)
+                raise
+            recorder.end(span)
+            yield chunk
+    finally:
+        chunks.close()
@@ -0,0 +1,304 @@
+import os
+import re
+import sqlite3
+import threading
+
+import requests
+
+from api_calls import get_artists, iter_songs, fetch_song
+from chords import CHORDS_RE
+
+MIRROR_PATH_ENV = "CHORDS_LOCAL_MIRROR"
+SEARCH_LIMIT = 200
+VERSION_KEY = "catalog_version"  # meta key of the last applied fetch_changes version
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artists (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS songs (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    artist_id INTEGER,
+    lyrics TEXT,
+    position INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS songs_artist ON songs (artist_id, position);
+CREATE VIRTUAL TABLE IF NOT EXISTS songs_fts USING fts5 (
+    title, artist, lyrics, tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+FTS_TOKEN_RE = re.compile(r"\w+")
+
+
+def song_artist(song: dict) -> dict:
+    artist = song.get("artist") or {}
+    return {"id": artist.get("id", song.get("artist_id")), "name": artist.get("name", "")}
+
+
+def searchable_lyrics(lyrics: str) -> str:
+    # Chord tokens are not indexed, so "Am" only matches real words
+    return CHORDS_RE.sub("", lyrics)
+
+
+def fts_query(query: str) -> str:
+    # Every word must match, each as a prefix: 'hel wor' -> '"hel"* "wor"*'
+    return " ".join(f'"{token}"*' for token in FTS_TOKEN_RE.findall(query))
+
+
+class LocalMirror:
+    """Optional on-disk copy of the catalog with an FTS5 lyrics index.
+
+    Lists and search are served from here first, so they are instant and keep
+    working while the backend is slow or down; ``catalog_sync.sync_catalog``
+    keeps it current in the background. Search results use the same shape
+    as the API's ``display=short`` search, including ``<em>`` highlights.
+
+    The database runs in WAL mode. Writes go through one connection behind a
+    lock; every thread reads through its own connection, which sees the last
+    committed state and never waits for a write, so a background sync
+    rewriting the whole catalog doesn't stall searches typed on the GUI
+    thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()  # serialises writers
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.create_function("strip_chords", 1, searchable_lyrics, deterministic=True)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.executescript(SCHEMA)
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        self._populated = False
+
+    @classmethod
+    def from_env(cls):
+        path = os.environ.get(MIRROR_PATH_ENV)
+        return cls(path) if path else None
+
+    def close(self):
+        with self._readers_lock:
+            for reader in self._readers:
+                reader.close()
+            self._readers = []
+        with self._lock:
+            self._db.close()
+
+    def _reader(self) -> sqlite3.Connection:
+        reader = getattr(self._local, "db", None)
+        if reader is None:
+            reader = self._local.db = sqlite3.connect(self.path, check_same_thread=False)
+            with self._readers_lock:
+                self._readers.append(reader)
+        return reader
+
+    def is_populated(self) -> bool:
+        # Once true it stays true, so after the first sync this costs nothing per keystroke
+        if not self._populated:
+            self._populated = self._reader().execute("SELECT EXISTS (SELECT 1 FROM artists)").fetchone()[0] == 1
+        return self._populated
+
+    def get_meta(self, key: str, default: str = None) -> str | None:
+        row = self._reader().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str):
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # Reads
+
+    def artists(self) -> list[dict]:
+        rows = self._reader().execute("SELECT id, name FROM artists ORDER BY position, id").fetchall()
+        return [{"id": artist_id, "name": name} for artist_id, name in rows]
+
+    def songs_page(self, artist_id = None, cursor = None, limit: int = 200):
+        # Same contract as api_calls.fetch_songs_page: (songs, next cursor)
+        offset = cursor or 0
+        sql = "SELECT id, title FROM songs"
+        params = []
+        if artist_id is not None:
+            sql += " WHERE artist_id = ?"
+            params.append(artist_id)
+        sql += " ORDER BY position, id LIMIT ? OFFSET ?"
+        params += [limit, offset]
+        rows = self._reader().execute(sql, params).fetchall()
+        songs = [{"id": song_id, "title": title} for song_id, title in rows]
+        return songs, (offset + len(songs) if len(songs) == limit else None)
+
+    def artist_song_ids(self, artist_id) -> list[int]:
+        return [row[0] for row in self._reader().execute("SELECT id FROM songs WHERE artist_id = ?", (artist_id,))]
+
+    def song(self, song_id) -> dict | None:
+        row = self._reader().execute(
+            "SELECT s.id, s.title, s.lyrics, a.id, a.name FROM songs s "
+            "LEFT JOIN artists a ON a.id = s.artist_id WHERE s.id = ?",
+            (song_id,)
+        ).fetchone()
+        if row is None or row[2] is None:
+            return None
+        return {"id": row[0], "title": row[1], "lyrics": row[2], "artist": {"id": row[3], "name": row[4]}}
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT) -> list[dict]:
+        match = fts_query(query)
+        if not match:
+            return []
+        rows = self._reader().execute(
+            "SELECT s.id, s.title, a.id, a.name, "
+            "highlight(songs_fts, 0, '<em>', '</em>'), "
+            "highlight(songs_fts, 1, '<em>', '</em>'), "
+            "snippet(songs_fts, 2, '<em>', '</em>', '...', 10) "
+            "FROM songs_fts JOIN songs s ON s.id = songs_fts.rowid "
+            "LEFT JOIN artists a ON a.id = s.artist_id "
+            "WHERE songs_fts MATCH ? ORDER BY rank LIMIT ?",
+            (match, limit)
+        ).fetchall()
+
+        results = []
+        for song_id, title, artist_id, artist_name, title_hl, artist_hl, lines_hl in rows:
+            highlights = {}
+            if "<em>" in title_hl:
+                highlights["title"] = [title_hl]
+            if "<em>" in artist_hl:
+                highlights["artist"] = [artist_hl]
+            if "<em>" in lines_hl:
+                highlights["lines"] = [" ".join(lines_hl.split())]
+            results.append({
+                "id": song_id,
+                "title": title,
+                "artist": {"id": artist_id, "name": artist_name},
+                "highlights": highlights,
+            })
+        return results
+
+    # Writes
+
+    def replace_catalog(self, artists: list[dict], songs: list[dict]):
+        # Full resync: mirror exactly the given catalog, keeping known lyrics the list lacks
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM artists")
+            self._db.executemany(
+                "INSERT INTO artists (id, name, position) VALUES (?, ?, ?)",
+                [(artist["id"], artist["name"], position) for position, artist in enumerate(artists)]
+            )
+            self._db.execute("CREATE TEMP TABLE IF NOT EXISTS synced_ids (id INTEGER PRIMARY KEY)")
+            self._db.execute("DELETE FROM synced_ids")
+            self._db.executemany("INSERT INTO synced_ids (id) VALUES (?)", [(song["id"],) for song in songs])
+            self._db.execute("DELETE FROM songs WHERE id NOT IN (SELECT id FROM synced_ids)")
+            self._upsert_songs(songs, positions=True)
+            self._db.execute("DELETE FROM songs_fts")
+            self._db.execute(
+                "INSERT INTO songs_fts (rowid, title, artist, lyrics) "
+                "SELECT s.id, s.title, COALESCE(a.name, ''), strip_chords(COALESCE(s.lyrics, '')) "
+                "FROM songs s LEFT JOIN artists a ON a.id = s.artist_id"
+            )
+
+    def upsert_songs(self, songs: list[dict]):
+        with self._lock, self._db:
+            self._upsert_songs(songs)
+            self._reindex_songs([song["id"] for song in songs])
+
+    def apply_changes(self, changes: dict):
+        # One transaction per api_calls.fetch_changes delta, stamped with its version
+        artists, songs = changes["artists"], changes["songs"]
+        with self._lock, self._db:
+            renamed = [artist["id"] for artist in artists["updated"]]
+            self._upsert_artists(artists["created"] + artists["updated"])
+            self._delete_artists(artists["deleted"])
+            upserted = songs["created"] + songs["updated"]
+            self._upsert_songs(upserted)
+            self._delete_songs(songs["deleted"])
+
+            # New titles/lyrics, and every song of a renamed artist, need new FTS rows
+            song_ids = {song["id"] for song in upserted}
+            for artist_id in renamed:
+                song_ids.update(
+                    row[0] for row in self._db.execute("SELECT id FROM songs WHERE artist_id = ?", (artist_id,))
+                )
+            self._reindex_songs(sorted(song_ids))
+            if changes["version"] is not None:  # None: a local mutation, see catalog_sync.local_changes
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (VERSION_KEY, str(changes["version"]))
+                )
+
+    def _upsert_artists(self, artists: list[dict]):
+        first = self._next_position("artists")
+        self._db.executemany(
+            "INSERT INTO artists (id, name, position) VALUES (?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET name = excluded.name",
+            [(artist["id"], artist["name"], first + i) for i, artist in enumerate(artists)]
+        )
+
+    def _delete_artists(self, artist_ids: list[int]):
+        params = [(artist_id,) for artist_id in artist_ids]
+        self._db.executemany(
+            "DELETE FROM songs_fts WHERE rowid IN (SELECT id FROM songs WHERE artist_id = ?)", params
+        )
+        self._db.executemany("DELETE FROM songs WHERE artist_id = ?", params)
+        self._db.executemany("DELETE FROM artists WHERE id = ?", params)
+
+    def _delete_songs(self, song_ids: list[int]):
+        params = [(song_id,) for song_id in song_ids]
+        self._db.executemany("DELETE FROM songs_fts WHERE rowid = ?", params)
+        self._db.executemany("DELETE FROM songs WHERE id = ?", params)
+
+    def _next_position(self, table: str) -> int:
+        return self._db.execute(f"SELECT COALESCE(MAX(position), -1) + 1 FROM {table}").fetchone()[0]
+
+    def _upsert_songs(self, songs: list[dict], positions: bool = False):
+        # positions=True takes the order of ``songs`` as the list order (full sync);
+        # otherwise new songs are appended and existing ones keep their place
+        first = 0 if positions else self._next_position("songs")
+        rows = [
+            (song["id"], song["title"], song_artist(song)["id"], song.get("lyrics"), first + i)
+            for i, song in enumerate(songs)
+        ]
+        position_update = ", position = excluded.position" if positions else ""
+        self._db.executemany(
+            "INSERT INTO songs (id, title, artist_id, lyrics, position) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET title = excluded.title, "
+            "artist_id = COALESCE(excluded.artist_id, songs.artist_id), "
+            "lyrics = COALESCE(excluded.lyrics, songs.lyrics)" + position_update,
+            rows
+        )
+
+    def _reindex_songs(self, song_ids: list[int]):
+        params = [(song_id,) for song_id in song_ids]
+        self._db.executemany("DELETE FROM songs_fts WHERE rowid = ?", params)
+        self._db.executemany(
+            "INSERT INTO songs_fts (rowid, title, artist, lyrics) "
+            "SELECT s.id, s.title, COALESCE(a.name, ''), strip_chords(COALESCE(s.lyrics, '')) "
+            "FROM songs s LEFT JOIN artists a ON a.id = s.artist_id WHERE s.id = ?",
+            params
+        )
+
+
+def sync_mirror(mirror: LocalMirror) -> int:
+    # Full download of the catalog into the mirror; runs on a worker thread
+    artists = get_artists()
+    songs = list(iter_songs(display="for_edit"))
+    mirror.replace_catalog(artists, songs)
+    return len(songs)
+
+
+def fetch_song_via_mirror(mirror: LocalMirror, song_id) -> dict:
+    # Network first so the editor never starts from stale lyrics; the mirror answers
+    # when the backend is unreachable and is refreshed with every song fetched
+    try:
+        song = fetch_song(song_id)
+    except requests.RequestException:
+        song = mirror.song(song_id)
+        if song is None:
+            raise
+        return song
+    mirror.upsert_songs([dict(song, id=song_id)])
+    return song
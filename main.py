@@ -1,14 +1,23 @@
+from startup_timing import startup  # first, so the launch clock includes the imports below
+
 import sys
 
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QApplication
 
 from application import MainWindow
 
+startup.mark("imports")
+
 
 def main() -> None:
     app = QApplication(sys.argv)
+    app.setApplicationName("ChordsManager")  # names the per-user cache/data directories
+    startup.mark("qapplication")
     window = MainWindow()
+    startup.mark("window_constructed")
     window.show()
+    QTimer.singleShot(0, window.start_initial_load)  # from the event loop, once show() has returned
     sys.exit(app.exec())
 
 if __name__ == "__main__":
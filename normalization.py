@@ -0,0 +1,186 @@
+"""Client-side lyrics normalization.
+
+The editor applies the local rules at once, offline too, and checks the
+result against the server's /songs/normalize in the background: the
+server stays the authority. Run verify against the real API:
+stub_server's endpoint is only a stand-in.
+
+    python normalization.py verify songs.jsonl   # compare with /songs/normalize, list mismatches
+    python normalization.py verify --catalog     # ... on every song of the catalog
+    python normalization.py batch songs.jsonl    # normalized lyrics as JSONL on stdout
+
+Corpus inputs are anything bulk_import reads: a directory of .txt files,
+a .csv or a .jsonl file.
+"""
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import api_calls
+from chords import CHORD_NAME_RE
+
+BATCH_WORKERS = None  # one process per CPU
+BATCH_CHUNK_SIZE = 64
+SERIAL_BATCH_SIZE = 256  # below this, starting processes costs more than it saves
+VERIFY_WORKERS = 8
+
+TOKEN_RE = re.compile(r"\S+")
+CHORD_SYNTAX_RE = re.compile(r"[#b/\d]|maj|min|dim|aug|sus|add")  # after the root letter
+COLUMN_GAP_RE = re.compile(r"\S {2,}\S")
+BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def chord_line(line: str) -> list[tuple[int, str]] | None:
+    # (column, chord) of every token when the line holds nothing but chords, e.g. "Am   C/G  (F)".
+    # Bare words like "A" or "Em" are lyrics too, so without brackets, chord syntax
+    # or column gaps somewhere on the line it is left alone
+    chords = []
+    marked = COLUMN_GAP_RE.search(line) is not None
+    for match in TOKEN_RE.finditer(line):
+        token = match.group()
+        if token.startswith("(") and token.endswith(")"):
+            token = token[1:-1]
+            marked = True
+        if not CHORD_NAME_RE.fullmatch(token):
+            return None
+        marked = marked or CHORD_SYNTAX_RE.search(token, 1) is not None
+        chords.append((match.start(), token))
+    return chords if chords and marked else None
+
+
+def merge_chords(chords: list[tuple[int, str]], lyric: str) -> str:
+    # Right to left, so the columns of the chords still to insert stay valid
+    for column, chord in reversed(chords):
+        lyric = lyric.ljust(column)
+        lyric = f"{lyric[:column]}({chord}){lyric[column:]}"
+    return lyric
+
+
+def normalize_lyrics_local(text: str) -> str:
+    """Normalize lyrics without a server round trip.
+
+    - line endings become "\\n", tabs are expanded, non-breaking spaces become
+      spaces and trailing whitespace is dropped;
+    - a line of chords written above a lyric line ("Am      G") is merged into
+      it as inline tokens at the same columns ("(Am)Hello (G)world"); a line
+      of bare chord-like words ("A", "C D E") only counts as chords with
+      brackets, chord syntax ("7", "#", "/") or column gaps;
+    - a chord line with no lyric under it becomes inline tokens "(Am) (G)";
+    - runs of blank lines collapse to one, and leading/trailing ones go.
+
+    Use ``verify_parity`` to check it against the server's /songs/normalize.
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\u00a0", " ")
+    lines = [line.expandtabs().rstrip() for line in text.split("\n")]
+
+    result = []
+    i = 0
+    while i < len(lines):
+        chords = chord_line(lines[i])
+        if chords is None:
+            result.append(lines[i])
+            i += 1
+            continue
+        lyric = lines[i + 1] if i + 1 < len(lines) else ""
+        if lyric and chord_line(lyric) is None:
+            result.append(merge_chords(chords, lyric))
+            i += 2
+        else:
+            result.append(" ".join(f"({chord})" for _, chord in chords))
+            i += 1
+
+    return BLANK_LINES_RE.sub("\n\n", "\n".join(result)).strip("\n")
+
+
+def normalize_batch(texts: list[str], workers: int = BATCH_WORKERS) -> list[str]:
+    # CPU-bound pure Python, so large batches are spread over processes rather than threads
+    if len(texts) < SERIAL_BATCH_SIZE or (workers or os.cpu_count() or 1) == 1:
+        return [normalize_lyrics_local(text) for text in texts]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(normalize_lyrics_local, texts, chunksize=BATCH_CHUNK_SIZE))
+
+
+class ParityMismatch:
+    __slots__ = ("source", "local", "server")
+
+    def __init__(self, source: str, local: str, server: str):
+        self.source = source
+        self.local = local
+        self.server = server
+
+    def diff(self) -> str:
+        return "\n".join(difflib.unified_diff(
+            self.server.splitlines(), self.local.splitlines(), "server", "local", lineterm=""
+        ))
+
+
+def verify_parity(corpus, workers: int = VERIFY_WORKERS) -> tuple[int, list[ParityMismatch]]:
+    """Normalize every (source, lyrics) pair locally and on the server.
+
+    Returns the number of texts compared and the mismatches. Server calls
+    run concurrently; a failed call is reported as a mismatch with the error
+    as the server text.
+    """
+    def compare(entry):
+        source, lyrics = entry
+        local = normalize_lyrics_local(lyrics)
+        try:
+            server = api_calls.normalize_lyrics(lyrics)
+        except Exception as e:
+            return ParityMismatch(source, local, f"<error: {e}>")
+        return None if server == local else ParityMismatch(source, local, server)
+
+    count = 0
+    mismatches = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for mismatch in pool.map(compare, corpus):
+            count += 1
+            if mismatch:
+                mismatches.append(mismatch)
+    return count, mismatches
+
+
+def iter_corpus(path: str = None):
+    # (source, lyrics) pairs from a bulk_import input, or from the whole catalog
+    if path is None:
+        for song in api_calls.iter_songs(display="for_edit"):
+            yield f"song {song['id']}", song.get("lyrics") or ""
+        return
+    from bulk_import import iter_items
+    for item in iter_items(path):
+        if item.lyrics is not None:
+            yield item.source, item.lyrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local lyrics normalization tools.")
+    parser.add_argument("mode", choices=["verify", "batch"])
+    parser.add_argument("path", nargs="?", help="directory of .txt files, or a .csv / .jsonl file")
+    parser.add_argument("--catalog", action="store_true", help="use every song of the catalog as the corpus")
+    parser.add_argument("--api-url", default=api_calls.API_URL)
+    args = parser.parse_args()
+    if (args.path is None) != args.catalog:
+        parser.error("give either a corpus path or --catalog")
+
+    api_calls.API_URL = args.api_url
+    corpus = iter_corpus(None if args.catalog else args.path)
+
+    if args.mode == "batch":
+        entries = list(corpus)
+        normalized = normalize_batch([lyrics for _, lyrics in entries])
+        for (source, _), lyrics in zip(entries, normalized):
+            print(json.dumps({"source": source, "lyrics": lyrics}))
+        return
+
+    count, mismatches = verify_parity(corpus)
+    for mismatch in mismatches:
+        print(f"--- {mismatch.source}\n{mismatch.diff()}", file=sys.stderr)
+    print(f"{count} compared, {len(mismatches)} mismatch(es)", file=sys.stderr)
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+PDF_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def export_key(song_versions: list[tuple[int, str]]) -> str:
+    # Same songs at the same versions -> same PDF, whatever order they were checked in
+    payload = json.dumps(sorted((song_id, str(version)) for song_id, version in song_versions))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class PdfCache:
+    """Exported PDFs on disk, named by ``export_key`` of their selection.
+
+    A file's modification time doubles as its last use: hits touch it and
+    ``put`` evicts the least recently used files once the directory grows
+    past ``max_bytes``. Files are written under a temporary name and renamed,
+    so a reader never sees a partial PDF.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = PDF_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key: str) -> str | None:
+        path = self.path_for(key)
+        with self._lock:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                return None
+        return path
+
+    def put(self, key: str, source_path: str):
+        fd, temp_path = tempfile.mkstemp(suffix=".part", dir=self.directory)
+        os.close(fd)
+        try:
+            shutil.copyfile(source_path, temp_path)
+            os.replace(temp_path, self.path_for(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        with self._lock:
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            for entry in self._entries():
+                os.unlink(entry.path)
+
+    def _entries(self) -> list[os.DirEntry]:
+        return [entry for entry in os.scandir(self.directory) if entry.name.endswith(".pdf")]
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        while entries and total > self.max_bytes:
+            entry = entries.pop(0)
+            total -= entry.stat().st_size
+            os.unlink(entry.path)
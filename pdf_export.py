@@ -0,0 +1,188 @@
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from api_calls import export_songs_to_pdf
+from pdf_cache import PdfCache
+
+try:
+    from pypdf import PdfWriter  # in requirements.txt; merges sharded exports, which are skipped without it
+except ImportError:
+    PdfWriter = None
+
+EXPORT_CHUNK_SIZE = 256 * 1024
+EXPORT_SHARD_SIZE = 50
+EXPORT_SHARD_WORKERS = 4
+EXPORT_SHARD_RETRIES = 2
+EXPORT_SHARD_BACKOFF = 0.5
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class ExportProgress:
+    # phase: "rendering" (waiting for the server, no byte yet), "downloading", "merging" or "done"
+    __slots__ = ("songs_done", "songs_total", "bytes_done", "bytes_total", "phase")
+
+    def __init__(self, songs_done: int, songs_total: int, bytes_done: int, bytes_total: int = None,
+                 phase: str = "downloading"):
+        self.songs_done = songs_done
+        self.songs_total = songs_total
+        self.bytes_done = bytes_done
+        self.bytes_total = bytes_total  # None while the size is unknown
+        self.phase = phase
+
+
+def temp_path_for(save_path: str) -> tuple[int, str]:
+    # Next to the destination, so the final os.replace stays on one filesystem
+    directory, name = os.path.split(os.path.abspath(save_path))
+    return tempfile.mkstemp(prefix=f".{name}.", suffix=".part", dir=directory)
+
+
+def stream_pdf_export(
+    song_ids: list[int], save_path: str, cache: PdfCache = None, cache_key: str = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE
+):
+    """Download the PDF of ``song_ids`` to ``save_path``, yielding ExportProgress.
+
+    The body is written to a temporary file in the destination directory and
+    renamed over ``save_path`` only when complete, so a failed or cancelled
+    export never leaves a truncated PDF behind. Closing the generator (the
+    executor does so when the export is cancelled) stops the download and
+    removes the temporary file.
+
+    With a ``cache`` and a ``cache_key`` (see ``pdf_cache.export_key``) a
+    cached PDF is copied into place without a request, and a downloaded one
+    is added to the cache.
+    """
+    songs_total = len(song_ids)
+    cached = yield from copy_from_cache(song_ids, save_path, cache, cache_key)
+    if cached:
+        return
+
+    # The request blocks until the server has rendered the whole PDF; it reports nothing meanwhile
+    yield ExportProgress(0, songs_total, 0, phase="rendering")
+    response = export_songs_to_pdf(song_ids)
+    length = response.headers.get("Content-Length")
+    bytes_total = int(length) if length and length.isdigit() else None
+
+    fd, temp_path = temp_path_for(save_path)
+    try:
+        with response, os.fdopen(fd, "wb") as f:
+            bytes_done = 0
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+                bytes_done += len(chunk)
+                yield ExportProgress(0, songs_total, bytes_done, bytes_total)
+        os.replace(temp_path, save_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    if cache and cache_key:
+        cache.put(cache_key, save_path)
+    yield ExportProgress(songs_total, songs_total, bytes_done, bytes_done, phase="done")
+
+
+def stream_sharded_pdf_export(
+    song_ids: list[int], save_path: str, cache: PdfCache = None, cache_key: str = None,
+    shard_size: int = EXPORT_SHARD_SIZE, max_workers: int = EXPORT_SHARD_WORKERS
+):
+    """Like ``stream_pdf_export``, but renders large selections in parallel.
+
+    The selection is split into shards of ``shard_size`` songs, which are
+    requested concurrently (at most ``max_workers`` at a time) so several
+    backend workers render at once. A failed shard is retried on its own.
+    The shard PDFs are merged locally in the original order with pypdf and
+    renamed into place. Progress is reported per finished shard. Without
+    pypdf, or for a selection that fits one shard, this is a plain
+    ``stream_pdf_export``.
+    """
+    if PdfWriter is None or len(song_ids) <= shard_size:
+        yield from stream_pdf_export(song_ids, save_path, cache, cache_key)
+        return
+
+    songs_total = len(song_ids)
+    cached = yield from copy_from_cache(song_ids, save_path, cache, cache_key)
+    if cached:
+        return
+
+    shards = [song_ids[i:i + shard_size] for i in range(0, songs_total, shard_size)]
+    cancelled = threading.Event()
+    with tempfile.TemporaryDirectory(prefix="chords-export-") as shard_dir:
+        pool = ThreadPoolExecutor(max_workers=min(max_workers, len(shards)))
+        try:
+            futures = {
+                pool.submit(download_shard, shard, os.path.join(shard_dir, f"{index}.pdf"), cancelled): index
+                for index, shard in enumerate(shards)
+            }
+            songs_done = bytes_done = 0
+            yield ExportProgress(songs_done, songs_total, bytes_done, phase="rendering")
+            for future in as_completed(futures):
+                bytes_done += future.result()
+                songs_done += len(shards[futures[future]])
+                yield ExportProgress(songs_done, songs_total, bytes_done, phase="rendering")
+        finally:
+            cancelled.set()  # stops the other shards when one failed or the export was cancelled
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        yield ExportProgress(songs_total, songs_total, bytes_done, phase="merging")
+        fd, temp_path = temp_path_for(save_path)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer = PdfWriter()
+                for index in range(len(shards)):
+                    writer.append(os.path.join(shard_dir, f"{index}.pdf"))
+                writer.write(f)
+            os.replace(temp_path, save_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    if cache and cache_key:
+        cache.put(cache_key, save_path)
+    size = os.path.getsize(save_path)
+    yield ExportProgress(songs_total, songs_total, size, size, phase="done")
+
+
+def download_shard(song_ids: list[int], path: str, cancelled: threading.Event,
+                   retries: int = EXPORT_SHARD_RETRIES) -> int:
+    # Runs on the shard pool; returns the size of the shard PDF written to path
+    for attempt in range(retries + 1):
+        try:
+            with open(path, "wb") as f:
+                with export_songs_to_pdf(song_ids) as response:
+                    for chunk in response.iter_content(chunk_size=EXPORT_CHUNK_SIZE):
+                        if cancelled.is_set():
+                            raise ExportCancelled()
+                        f.write(chunk)
+            return os.path.getsize(path)
+        except ExportCancelled:
+            raise
+        except Exception:
+            if attempt == retries or cancelled.wait(EXPORT_SHARD_BACKOFF * 2 ** attempt):
+                raise
+
+
+def copy_from_cache(song_ids: list[int], save_path: str, cache: PdfCache, cache_key: str):
+    # Generator helper: copies a cached export into place; returns whether there was one
+    cached_path = cache.get(cache_key) if cache and cache_key else None
+    if not cached_path:
+        return False
+    size = copy_into_place(cached_path, save_path)
+    yield ExportProgress(len(song_ids), len(song_ids), size, size, phase="done")
+    return True
+
+
+def copy_into_place(source_path: str, save_path: str) -> int:
+    fd, temp_path = temp_path_for(save_path)
+    os.close(fd)
+    try:
+        shutil.copyfile(source_path, temp_path)
+        os.replace(temp_path, save_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return os.path.getsize(save_path)
@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_MAX_ENTRIES = 64
+CACHE_TTL = 10.0
+
+
+class CacheEntry:
+    __slots__ = ("data", "etag", "last_modified", "stored_at")
+
+    def __init__(self, data, etag: str = None, last_modified: str = None):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = time.monotonic()
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.monotonic() - self.stored_at < ttl
+
+    def validators(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Thread-safe LRU of parsed GET responses keyed by full URL (path + query).
+
+    Entries younger than ``ttl`` are served without touching the network.
+    Older entries are kept for conditional revalidation: their ETag /
+    Last-Modified are sent back and a 304 reuses the already parsed data.
+    Cached data is shared between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, data, etag: str = None, last_modified: str = None):
+        with self._lock:
+            self._entries[key] = CacheEntry(data, etag, last_modified)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.stored_at = time.monotonic()
+
+    def invalidate(self, prefix: str = ""):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,61 @@
+import re
+import time
+from collections import OrderedDict
+
+SEARCH_CACHE_SIZE = 32
+SEARCH_CACHE_TTL = 60.0
+
+HIGHLIGHT_TAGS_RE = re.compile(r"</?em>")
+
+
+def song_matches(song: dict, query: str) -> bool:
+    # Local approximation of the server match: title, artist or a highlighted snippet
+    texts = [song.get("title", ""), song.get("artist", {}).get("name", "")]
+    for snippets in song.get("highlights", {}).values():
+        texts.extend(HIGHLIGHT_TAGS_RE.sub("", snippet) for snippet in snippets)
+    return any(query in text.casefold() for text in texts)
+
+
+class SearchCache:
+    """Small LRU of complete search results keyed by normalized query.
+
+    ``lookup`` returns ``(results, exact)``. An exact hit can be shown as is.
+    Otherwise, if a cached query is a prefix of the new one, its results
+    are filtered locally and returned with ``exact=False`` as a provisional
+    answer while the server confirms.
+    """
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_SIZE, ttl: float = SEARCH_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # query -> (stored_at, results)
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        return " ".join(query.casefold().split())
+
+    def put(self, query: str, results: list[dict]):
+        key = self.normalize(query)
+        self._entries[key] = (time.monotonic(), results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def lookup(self, query: str) -> tuple[list[dict] | None, bool]:
+        key = self.normalize(query)
+        now = time.monotonic()
+
+        entry = self._entries.get(key)
+        if entry is not None and now - entry[0] < self.ttl:
+            self._entries.move_to_end(key)
+            return entry[1], True
+
+        # Longest fresh cached prefix of the query
+        for length in range(len(key) - 1, 0, -1):
+            entry = self._entries.get(key[:length])
+            if entry is not None and now - entry[0] < self.ttl:
+                return [song for song in entry[1] if song_matches(song, key)], False
+        return None, False
+
+    def clear(self):
+        self._entries.clear()
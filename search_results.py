@@ -0,0 +1,213 @@
+from collections import OrderedDict
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QPointF, QSize, Qt, Signal
+from PySide6.QtGui import QStaticText
+from PySide6.QtWidgets import QStyle, QStyledItemDelegate
+
+from api_calls import SEARCH_PAGE_SIZE
+
+HighlightRole = Qt.UserRole + 1
+
+LAYOUT_CACHE_SIZE = 1024
+MARGINS = (5, 2, 5, 8)  # left, top, right, bottom
+LINE_SPACING = 1
+
+
+def pick_highlight(song: dict) -> str:
+    highlights = song.get("highlights", {})
+    if highlights.get("title"):
+        return highlights.get("title")[0]
+    elif highlights.get("artist"):
+        return highlights.get("artist")[0]
+    elif highlights.get("lines"):
+        return highlights.get("lines")[0]
+    return ""
+
+
+class SearchResultModel(QAbstractListModel):
+    """Search hits, paged like SongListModel.
+
+    Server results come in one page at a time: when the dropdown is
+    scrolled to the end, ``fetchMore`` emits ``page_requested`` and the
+    owner answers with ``append_page``. Cached or local results have no
+    further pages.
+    """
+
+    page_requested = Signal(str, object, int)  # query, page cursor, limit
+
+    def __init__(self, parent=None, page_size: int = SEARCH_PAGE_SIZE):
+        super().__init__(parent)
+        self.page_size = page_size
+        self._rows = []  # (song id, "title - artist", highlight html)
+        self._ids = set()
+        self.message = None  # shown as a single non-selectable row when there are no results
+        self.query = None  # the server query the rows answer, while more pages can be fetched
+        self._next_cursor = None
+        self._has_more = False
+        self._loading = False
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows) if self.message is None else 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if self.message is not None:
+            if role == Qt.DisplayRole:
+                return self.message
+            if role == Qt.ForegroundRole:
+                return Qt.gray
+            return None
+
+        song_id, title_artist, highlight = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return title_artist
+        if role == HighlightRole:
+            return highlight
+        if role == Qt.UserRole:
+            return song_id
+        return None
+
+    def flags(self, index):
+        if self.message is not None:
+            return Qt.ItemIsEnabled
+        return super().flags(index)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        self.page_requested.emit(self.query, self._next_cursor, self.page_size)
+
+    def set_message(self, message: str):
+        self.beginResetModel()
+        self._rows = []
+        self._ids = set()
+        self.message = message
+        self.query = None
+        self._has_more = False
+        self._loading = False
+        self.endResetModel()
+
+    def set_songs(self, songs: list[dict], query: str = None, next_cursor=None):
+        # query and next_cursor: the first page of a server search with more to come
+        self.beginResetModel()
+        self.message = None
+        self._rows = [self._row(song) for song in songs]
+        self._ids = {song["id"] for song in songs}
+        self.query = query
+        self._next_cursor = next_cursor
+        self._has_more = next_cursor is not None
+        self._loading = False
+        self.endResetModel()
+
+    def append_page(self, songs: list[dict], next_cursor, query: str, cursor) -> list[dict]:
+        # Returns the songs added: none for an answer to a request made before a reset
+        if query != self.query or cursor != self._next_cursor or not self._loading:
+            return []
+        self._loading = False
+        fresh = [song for song in songs if song["id"] not in self._ids]
+        if songs and not fresh:
+            next_cursor = None  # server ignores offsets and repeats the first page
+        self._next_cursor = next_cursor
+        self._has_more = next_cursor is not None
+
+        if fresh:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(fresh) - 1)
+            self._rows.extend(self._row(song) for song in fresh)
+            self._ids.update(song["id"] for song in fresh)
+            self.endInsertRows()
+        return fresh
+
+    def page_failed(self):
+        # The rows loaded so far stay
+        self._loading = False
+        self._has_more = False
+
+    def is_complete(self) -> bool:
+        return not self._has_more
+
+    @staticmethod
+    def _row(song: dict):
+        title = song.get("title", "Unknown Title")
+        artist_name = song.get("artist", {}).get("name", "Unknown Artist")
+        return song["id"], f"{title} - {artist_name}", pick_highlight(song)
+
+
+class SearchResultDelegate(QStyledItemDelegate):
+    """Paints a search hit as "title - artist" over its highlighted snippet.
+
+    Replaces a QWidget with two QLabels per row. Text layouts are built once
+    per distinct string as QStaticText and reused from an LRU, and every row
+    has the same height, so thousands of hits render like a plain list.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._layouts = OrderedDict()
+
+    def row_height(self, option) -> int:
+        line_height = option.fontMetrics.height()
+        return MARGINS[1] + line_height + LINE_SPACING + line_height + MARGINS[3]
+
+    def sizeHint(self, option, index):
+        if index.data(Qt.UserRole) is None:
+            return super().sizeHint(option, index)  # plain message row
+        return QSize(option.rect.width(), self.row_height(option))
+
+    def paint(self, painter, option, index):
+        if index.data(Qt.UserRole) is None:
+            super().paint(painter, option, index)
+            return
+
+        self.initStyleOption(option, index)
+        title_artist = option.text
+        option.text = ""
+        style = option.widget.style() if option.widget else None
+        if style:
+            style.drawControl(QStyle.CE_ItemViewItem, option, painter, option.widget)
+
+        rect = option.rect
+        x = rect.left() + MARGINS[0]
+        y = rect.top() + MARGINS[1]
+        line_height = option.fontMetrics.height()
+
+        painter.save()
+        painter.setClipRect(rect.adjusted(MARGINS[0], 0, -MARGINS[2], 0))
+        painter.setFont(option.font)
+        # Readable on the selection background too, whatever the palette
+        selected = option.state & QStyle.State_Selected
+        painter.setPen((option.palette.highlightedText() if selected else option.palette.text()).color())
+        painter.drawStaticText(QPointF(x, y), self._layout(title_artist, Qt.PlainText))
+        highlight = index.data(HighlightRole)
+        if highlight:
+            painter.drawStaticText(
+                QPointF(x, y + line_height + LINE_SPACING), self._layout(self._highlight_html(highlight), Qt.RichText)
+            )
+        painter.restore()
+
+    @staticmethod
+    def _highlight_html(highlight_text: str) -> str:
+        highlight_text = highlight_text.replace(
+            "<em>", '<em style="color: rgba(179, 87, 87, 0.7); font-style: italic;">'
+        )
+        return f'<span style="font-style: italic; color: gray;">{highlight_text}</span>'
+
+    def _layout(self, text: str, text_format) -> QStaticText:
+        key = (text, text_format)
+        layout = self._layouts.get(key)
+        if layout is None:
+            layout = QStaticText(text)
+            layout.setTextFormat(text_format)
+            self._layouts[key] = layout
+            if len(self._layouts) > LAYOUT_CACHE_SIZE:
+                self._layouts.popitem(last=False)
+        else:
+            self._layouts.move_to_end(key)
+        return layout
@@ -0,0 +1,322 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt, Signal
+
+from api_calls import SONGS_PAGE_SIZE, iter_song_pages
+
+
+class SongSelection:
+    """The checked songs: explicit ids, or every song of a list except some.
+
+    "Select All" stays in the second form, so it never needs the whole list
+    loaded; ``resolve`` turns it into ids on a worker thread, page by page
+    from the mirror or the server.
+    """
+
+    __slots__ = ("ids", "artist_id", "excluded", "everything")
+
+    def __init__(self, ids: list[int] = (), artist_id=None, excluded=(), everything: bool = False):
+        self.ids = list(ids)
+        self.artist_id = artist_id
+        self.excluded = frozenset(excluded)
+        self.everything = everything
+
+    def __bool__(self):
+        return self.everything or bool(self.ids)
+
+    def describe(self) -> str:
+        if not self.everything:
+            return f"{len(self.ids)} song(s)"
+        return f"all songs except {len(self.excluded)}" if self.excluded else "all songs"
+
+    def resolve(self, mirror=None) -> list[int]:
+        if not self.everything:
+            return list(self.ids)
+        if mirror is not None and mirror.is_populated():
+            pages = iter_mirror_pages(mirror, self.artist_id)
+        else:
+            pages = iter_song_pages(self.artist_id)
+        return [song["id"] for page in pages for song in page if song["id"] not in self.excluded]
+
+
+def iter_mirror_pages(mirror, artist_id=None, page_size: int = SONGS_PAGE_SIZE):
+    cursor = None
+    while True:
+        songs, cursor = mirror.songs_page(artist_id, cursor, page_size)
+        yield songs
+        if cursor is None:
+            return
+
+
+class SongListModel(QAbstractListModel):
+    """Checkable song list that is filled page by page as the view scrolls.
+
+    The view asks for more rows through ``canFetchMore``/``fetchMore``; the
+    model emits ``page_requested`` and the owner answers with
+    ``append_page``. Check state is kept as a set of song ids (or, after
+    "select all", as the set of ids unchecked since), so toggling every song
+    is a single dataChanged instead of a walk over the rows.
+    """
+
+    page_requested = Signal(object, object, int)  # artist id, page cursor, limit
+    placeholder_changed = Signal(bool)
+
+    def __init__(self, parent=None, page_size: int = SONGS_PAGE_SIZE):
+        super().__init__(parent)
+        self.page_size = page_size
+        self.artist_id = None
+        self._songs = []
+        self._rows = {}  # song id -> row
+        self._next_cursor = None
+        self._has_more = False
+        self._loading = False
+        self._placeholder = False  # rows are a snapshot awaiting the first page
+        self._removed = set()  # ids deleted or being deleted: pages loaded later skip them
+        self.generation = 0  # bumped whenever the rows are replaced wholesale
+        self._all_checked = False
+        self._toggled = set()  # checked ids, or unchecked ids while all are checked
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._songs)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        song = self._songs[index.row()]
+        if role == Qt.DisplayRole:
+            return song["title"]
+        if role == Qt.UserRole:
+            return song["id"]
+        if role == Qt.CheckStateRole and not self._placeholder:
+            return Qt.Checked if self.is_checked(song["id"]) else Qt.Unchecked
+        return None
+
+    def flags(self, index):
+        # Placeholder rows can be opened but not checked: they may be gone on the server
+        if self._placeholder:
+            return super().flags(index)
+        return super().flags(index) | Qt.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid() or self._placeholder:
+            return False
+        song_id = self._songs[index.row()]["id"]
+        checked = value in (Qt.Checked, Qt.Checked.value)
+        if checked != self._all_checked:
+            self._toggled.add(song_id)
+        else:
+            self._toggled.discard(song_id)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        self.page_requested.emit(self.artist_id, self._next_cursor, self.page_size)
+
+    def show_placeholder(self, songs: list[dict]):
+        # Rows of the "All" list saved by the last session, shown until reset(None)
+        # fetches the first page; nothing is requested meanwhile
+        self.beginResetModel()
+        self.artist_id = None
+        self._songs = list(songs)
+        self._rows = {song["id"]: row for row, song in enumerate(self._songs)}
+        self._next_cursor = None
+        self._has_more = False
+        self._loading = False
+        self._placeholder = True
+        self._removed = set()
+        self.generation += 1
+        self.endResetModel()
+        self.placeholder_changed.emit(True)
+
+    def reset(self, artist_id=None):
+        if self._placeholder and artist_id is None:
+            # Keep the placeholder rows on screen; append_page swaps them for the first page
+            self._has_more = True
+            self.fetchMore()
+            return
+
+        was_placeholder = self._placeholder
+        self.beginResetModel()
+        self.artist_id = artist_id
+        self._songs = []
+        self._rows = {}
+        self._placeholder = False
+        self.generation += 1
+        self._next_cursor = None
+        self._has_more = True
+        self._loading = False
+        self._removed = set()
+        self._all_checked = False
+        self._toggled = set()
+        self.endResetModel()
+        if was_placeholder:
+            self.placeholder_changed.emit(False)
+        self.fetchMore()
+
+    def append_page(self, songs: list[dict], next_cursor, cursor):
+        if cursor != self._next_cursor or not self._loading:
+            return  # answer to a request made before a reset
+        self._loading = False
+        if self._placeholder:
+            self._placeholder = False
+            self.placeholder_changed.emit(False)
+            if songs == self._songs:
+                # Nothing changed since the snapshot: no reset, no flicker; the rows only become checkable
+                self._next_cursor = next_cursor
+                self._has_more = next_cursor is not None
+                if self._songs:
+                    self.dataChanged.emit(self.index(0), self.index(len(self._songs) - 1), [Qt.CheckStateRole])
+                return
+            self.beginResetModel()
+            self._songs = []
+            self._rows = {}
+            self.generation += 1
+            self.endResetModel()
+        songs = [song for song in songs if song["id"] not in self._removed]
+        fresh = [song for song in songs if song["id"] not in self._rows]
+        if songs and not fresh:
+            next_cursor = None  # server ignores offsets and repeats the first page
+        songs = fresh  # rows already shown when the list shifted under the offsets
+        self._next_cursor = next_cursor
+        self._has_more = next_cursor is not None
+
+        if songs:
+            first = len(self._songs)
+            self.beginInsertRows(QModelIndex(), first, first + len(songs) - 1)
+            for row, song in enumerate(songs, first):
+                self._songs.append(song)
+                self._rows[song["id"]] = row
+            self.endInsertRows()
+
+    def apply_changes(self, delta: dict):
+        # Patch the loaded rows from the "songs" part of an api_calls.fetch_changes delta
+        removed = set(delta["deleted"])
+        appended = []
+        for song in delta["created"] + delta["updated"]:
+            row = self._rows.get(song["id"])
+            if not self._in_filter(song):
+                if row is not None:
+                    removed.add(song["id"])  # moved to another artist
+            elif row is not None:
+                self._songs[row] = dict(self._songs[row], title=song["title"])
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.DisplayRole])
+            elif not self._has_more:
+                appended.append({"id": song["id"], "title": song["title"]})  # unloaded pages will bring it
+
+        rows = sorted((self._rows[song_id] for song_id in removed if song_id in self._rows), reverse=True)
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._songs[row]
+            self.endRemoveRows()
+        if rows:
+            self._rows = {song["id"]: row for row, song in enumerate(self._songs)}
+            if isinstance(self._next_cursor, int):
+                # Offsets of the unloaded pages moved back by the removed rows
+                self._next_cursor = max(self._next_cursor - len(rows), 0)
+                if self._loading:
+                    self._loading = False  # the page in flight used the old offset
+                    self.fetchMore()
+
+        if appended:
+            first = len(self._songs)
+            self.beginInsertRows(QModelIndex(), first, first + len(appended) - 1)
+            for row, song in enumerate(appended, first):
+                self._songs.append(song)
+                self._rows[song["id"]] = row
+            self.endInsertRows()
+
+    def set_title(self, song_id, title: str) -> str | None:
+        # Optimistic rename; returns the previous title for a rollback, None if the song isn't loaded
+        row = self._rows.get(song_id)
+        if row is None:
+            return None
+        previous = self._songs[row]["title"]
+        self._songs[row] = dict(self._songs[row], title=title)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+        return previous
+
+    def remove_songs(self, song_ids) -> list[tuple[int, dict]]:
+        # Optimistic delete; returns the (row, song) pairs confirm_removed or restore_songs need.
+        # The offsets of the unloaded pages stay until the server has deleted the rows
+        removed = sorted((self._rows[song_id], self._songs[self._rows[song_id]])
+                         for song_id in song_ids if song_id in self._rows)
+        for row, song in reversed(removed):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._songs[row]
+            self.endRemoveRows()
+        if removed:
+            self._rows = {song["id"]: row for row, song in enumerate(self._songs)}
+        self._removed.update(song["id"] for _, song in removed)
+        return removed
+
+    def confirm_removed(self, removed: list[tuple[int, dict]], song_ids, generation: int):
+        # The server deleted song_ids, among them the rows remove_songs took out
+        if generation != self.generation:
+            return
+        self._removed.update(song_ids)
+        self._toggled.difference_update(song_ids)
+        if removed and isinstance(self._next_cursor, int):
+            # Offsets of the unloaded pages moved back by the removed rows
+            self._next_cursor = max(self._next_cursor - len(removed), 0)
+            if self._loading:
+                self._loading = False  # the page in flight used the old offset
+                self.fetchMore()
+
+    def restore_songs(self, removed: list[tuple[int, dict]], generation: int):
+        # Put back rows of a failed delete, unless the list was reloaded since
+        if generation != self.generation:
+            return
+        restored = 0
+        for row, song in removed:
+            if song["id"] in self._rows:
+                continue  # a page loaded meanwhile brought it back already
+            row = min(row, len(self._songs))
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._songs.insert(row, song)
+            self._rows = {song["id"]: row for row, song in enumerate(self._songs)}
+            self.endInsertRows()
+            restored += 1
+        self._removed.difference_update(song["id"] for _, song in removed)
+
+    def _in_filter(self, song: dict) -> bool:
+        if self.artist_id is None:
+            return True
+        artist = song.get("artist") or {}
+        return artist.get("id", song.get("artist_id")) == self.artist_id
+
+    def page_failed(self):
+        # Placeholder rows stay: better the last session's list than an empty one
+        self._loading = False
+        self._has_more = False
+
+    def is_placeholder(self) -> bool:
+        return self._placeholder
+
+    def songs(self, limit: int = None) -> list[dict]:
+        return self._songs[:limit]
+
+    def is_checked(self, song_id) -> bool:
+        return (song_id in self._toggled) != self._all_checked
+
+    def set_all_checked(self, checked: bool):
+        self._all_checked = checked
+        self._toggled = set()
+        if self._songs:
+            self.dataChanged.emit(self.index(0), self.index(len(self._songs) - 1), [Qt.CheckStateRole])
+
+    def selection(self) -> SongSelection:
+        if self._all_checked:
+            return SongSelection(artist_id=self.artist_id, excluded=self._toggled, everything=True)
+        return SongSelection(sorted((song_id for song_id in self._toggled if song_id in self._rows), key=self._rows.get))
+
+    def checked_loaded_ids(self) -> list[int]:
+        # The checked rows on screen, e.g. to remove them optimistically
+        if self._all_checked:
+            return [song["id"] for song in self._songs if song["id"] not in self._toggled]
+        return self.selection().ids
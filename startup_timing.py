@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+
+STARTUP_REPORT_ENV = "CHORDS_STARTUP_REPORT"  # "1": print the report to stderr
+REPORT_AFTER = ("first_paint", "artists_loaded", "songs_loaded")
+
+
+class StartupTimer:
+    """Milestones of one application start, in ms since this module was imported.
+
+    main.py imports it first, so the origin is as close to process start as
+    Python code gets. Every milestone is kept once; the report is printed
+    when all of REPORT_AFTER have been reached.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.marks = {}
+        self.reported = False
+
+    def mark(self, name: str):
+        if name in self.marks:
+            return
+        self.marks[name] = (time.perf_counter() - self.origin) * 1000
+        if not self.reported and all(milestone in self.marks for milestone in REPORT_AFTER):
+            self.reported = True
+            if os.environ.get(STARTUP_REPORT_ENV, "") not in ("", "0"):
+                print(self.report(), file=sys.stderr)
+
+    def report(self) -> str:
+        lines = ["Startup timing (ms since launch):"]
+        previous = 0.0
+        for name, elapsed in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"  {name:<20} {elapsed:9.1f}  (+{elapsed - previous:.1f})")
+            previous = elapsed
+        return "\n".join(lines)
+
+
+startup = StartupTimer()
@@ -0,0 +1,380 @@
+"""Local stand-in for the Chords API, for measuring and exercising the client.
+
+    python stub_server.py --port 8000 --latency 50 --songs 5000 --lyrics-size 2000
+
+Implements every endpoint api_calls.py uses (artists, songs with paging and
+search, song detail, create/update/delete, to_pdf, normalize, changes) on
+an in-memory catalog, with ETag/304 support. --latency adds a fixed delay
+to every response. Per-request counts and bytes are exposed at GET /_stats
+and reset with POST /_stats/reset.
+
+normalize only unifies line endings and trailing whitespace: the real
+server's rules are not known here, so it is no reference for
+normalization.py verify.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import socket
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from chords import CHORDS_RE
+
+DEFAULT_ARTISTS = 50
+DEFAULT_SONGS = 2000
+DEFAULT_LYRICS_SIZE = 1500
+CHANGE_LOG_SIZE = 10000  # older versions get 410 Gone
+
+WORDS = ("love", "night", "road", "light", "heart", "home", "rain", "fire", "sky", "dream", "and", "the", "you")
+CHORDS = ("C", "G", "Am", "F", "Dm7", "E", "Bb", "F#m", "Gsus4", "C/E")
+
+
+def make_lyrics(rng: random.Random, size: int) -> str:
+    lines = []
+    length = 0
+    while length < size:
+        words = [rng.choice(WORDS) for _ in range(7)]
+        words[rng.randrange(7)] = f"({rng.choice(CHORDS)}){rng.choice(WORDS)}"
+        line = " ".join(words)
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def make_pdf(page_count: int) -> bytes:
+    # Smallest valid PDF with one blank page per song, so exports can be merged
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + i} 0 R" for i in range(page_count))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode())
+    objects += [b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] >>"] * page_count
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def highlight(text: str, query: str) -> str | None:
+    match = re.search(re.escape(query), text, re.IGNORECASE)
+    if not match:
+        return None
+    start = max(match.start() - 30, 0)
+    return f"{text[start:match.start()]}<em>{match.group()}</em>{text[match.end():match.end() + 30]}"
+
+
+class Catalog:
+    """In-memory artists and songs with a versioned change log."""
+
+    def __init__(self, artists: int = DEFAULT_ARTISTS, songs: int = DEFAULT_SONGS,
+                 lyrics_size: int = DEFAULT_LYRICS_SIZE, seed: int = 0):
+        rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.artists = {i: {"id": i, "name": f"Artist {i}"} for i in range(1, artists + 1)}
+        self.songs = {}
+        for song_id in range(1, songs + 1):
+            artist = self.artists[rng.randrange(1, artists + 1)]
+            title = " ".join(rng.choice(WORDS) for _ in range(3)).title()
+            self.songs[song_id] = {"id": song_id, "title": title, "artist": artist,
+                                   "lyrics": make_lyrics(rng, lyrics_size)}
+        self.next_artist_id = artists + 1
+        self.next_song_id = songs + 1
+        self.version = 1
+        self.log = []  # (version, resource, kind, payload)
+        self.plain = {}  # song id -> (lyrics, lyrics without chords)
+
+    def plain_lyrics(self, song: dict) -> str:
+        # Lyrics without chord tokens, as searched; cached until the lyrics change
+        cached = self.plain.get(song["id"])
+        if cached is None or cached[0] is not song["lyrics"]:
+            cached = self.plain[song["id"]] = (song["lyrics"], CHORDS_RE.sub("", song["lyrics"]))
+        return cached[1]
+
+    def record(self, resource: str, kind: str, payload):
+        self.version += 1
+        self.log.append((self.version, resource, kind, payload))
+        del self.log[:-CHANGE_LOG_SIZE]
+
+    def changes_since(self, since: int) -> dict | None:
+        if self.log and since < self.log[0][0] - 1 or since > self.version:
+            return None
+        changes = {"version": self.version}
+        for resource in ("artists", "songs"):
+            changes[resource] = {"created": [], "updated": [], "deleted": []}
+        for version, resource, kind, payload in self.log:
+            if version > since:
+                changes[resource][kind].append(payload)
+        return changes
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    catalog: Catalog = None
+    latency = 0.0
+    stats = None  # shared dict and the lock guarding it, see StubServer
+    stats_lock = None
+
+    # Plumbing
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; don't let Nagle delay the second
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def count(self, key: str, amount: int = 1):
+        # Handlers run on one thread per connection; += on a shared dict is not atomic
+        with self.stats_lock:
+            self.stats[key] += amount
+
+    def body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        self.count("bytes_in", len(raw))
+        return json.loads(raw) if raw else {}
+
+    def send(self, status: int, data=None, content_type: str = "application/json", cacheable: bool = False):
+        payload = data if isinstance(data, bytes) else (b"" if data is None else json.dumps(data).encode())
+        if cacheable:
+            etag = '"%s"' % hashlib.md5(payload).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                status, payload = 304, b""
+        self.send_response(status)
+        if cacheable:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        self.count("bytes_out", len(payload))
+
+    def dispatch(self, method: str):
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if parts[:1] != ["_stats"]:
+            with self.stats_lock:
+                self.stats["requests"] += 1
+                self.stats["by_endpoint"][f"{method} /{'/'.join(parts[:1])}"] += 1
+        handler = getattr(self, f"{method.lower()}_{parts[0] if parts else 'root'}", None)
+        if handler is None:
+            self.send(404, {"detail": "Not Found"})
+            return
+        handler(parts[1:], query)
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    # Endpoints
+
+    def get__stats(self, parts, query):
+        self.send(200, self.server.stats)
+
+    def post__stats(self, parts, query):
+        self.server.reset_stats()
+        self.send(200, {})
+
+    def get_artists(self, parts, query):
+        with self.catalog.lock:
+            artists = list(self.catalog.artists.values())
+        self.send(200, artists, cacheable=True)
+
+    def post_artists(self, parts, query):
+        name = self.body().get("name", "").strip()
+        catalog = self.catalog
+        with catalog.lock:
+            if any(artist["name"] == name for artist in catalog.artists.values()):
+                self.send(400, {"detail": f"Artist '{name}' already exists"})
+                return
+            artist = {"id": catalog.next_artist_id, "name": name}
+            catalog.next_artist_id += 1
+            catalog.artists[artist["id"]] = artist
+            catalog.record("artists", "created", artist)
+        self.send(200, artist)
+
+    def delete_artists(self, parts, query):
+        catalog = self.catalog
+        with catalog.lock:
+            artist = catalog.artists.pop(int(parts[0]), None) if parts else None
+            if artist is None:
+                self.send(404, {"detail": "Artist not found"})
+                return
+            for song_id in [s["id"] for s in catalog.songs.values() if s["artist"]["id"] == artist["id"]]:
+                del catalog.songs[song_id]
+                catalog.record("songs", "deleted", song_id)
+            catalog.record("artists", "deleted", artist["id"])
+        self.send(204)
+
+    def get_songs(self, parts, query):
+        catalog = self.catalog
+        if parts:
+            with catalog.lock:
+                song = catalog.songs.get(int(parts[0]))
+            if song is None:
+                self.send(404, {"detail": "Song not found"})
+            else:
+                self.send(200, song, cacheable=True)
+            return
+
+        with catalog.lock:
+            songs = list(catalog.songs.values())
+        artist = query.get("artists")
+        if artist not in (None, "", "None"):
+            songs = [song for song in songs if str(song["artist"]["id"]) == artist]
+
+        offset = int(query.get("offset", 0))
+        limit = int(query["limit"]) if "limit" in query else None
+        search = query.get("search")
+        if search:
+            results = []
+            for song in songs:
+                if limit is not None and len(results) == offset + limit:
+                    break
+                highlights = {}
+                for field, text in (("title", song["title"]), ("artist", song["artist"]["name"]),
+                                    ("lines", catalog.plain_lyrics(song))):
+                    snippet = highlight(text, search)
+                    if snippet:
+                        highlights[field] = [snippet]
+                if highlights:
+                    results.append({"id": song["id"], "title": song["title"], "artist": song["artist"],
+                                    "highlights": highlights})
+            songs = results
+        elif query.get("display") != "for_edit":
+            songs = [{"id": song["id"], "title": song["title"]} for song in songs]
+
+        page = songs[offset:offset + limit] if limit is not None else songs[offset:]
+        self.send(200, page, cacheable=not search)
+
+    def post_songs(self, parts, query):
+        data = self.body()
+        catalog = self.catalog
+        if parts == ["to_pdf"]:
+            self.send(200, make_pdf(max(len(data.get("song_ids", [])), 1)), content_type="application/pdf")
+            return
+        if parts == ["normalize"]:
+            lines = data.get("lyrics", "").replace("\r\n", "\n").replace("\r", "\n").split("\n")
+            self.send(200, "\n".join(line.rstrip() for line in lines).strip("\n"))
+            return
+        with catalog.lock:
+            artist = catalog.artists.get(data.get("artist_id"))
+            if artist is None:
+                self.send(422, {"detail": "Unknown artist"})
+                return
+            song = {"id": catalog.next_song_id, "title": data["title"], "artist": artist, "lyrics": data["lyrics"]}
+            catalog.next_song_id += 1
+            catalog.songs[song["id"]] = song
+            catalog.record("songs", "created", song)
+        self.send(200, song)
+
+    def put_songs(self, parts, query):
+        data = self.body()
+        catalog = self.catalog
+        with catalog.lock:
+            song = catalog.songs.get(int(parts[0])) if parts else None
+            artist = catalog.artists.get(data.get("artist_id"))
+            if song is None or artist is None:
+                self.send(404, {"detail": "Song or artist not found"})
+                return
+            song = dict(song, title=data["title"], artist=artist, lyrics=data["lyrics"])
+            catalog.songs[song["id"]] = song
+            catalog.record("songs", "updated", song)
+        self.send(200, song)
+
+    def delete_songs(self, parts, query):
+        song_ids = self.body().get("song_ids", [])
+        catalog = self.catalog
+        with catalog.lock:
+            for song_id in song_ids:
+                if catalog.songs.pop(song_id, None) is not None:
+                    catalog.record("songs", "deleted", song_id)
+        self.send(204)
+
+    def get_changes(self, parts, query):
+        catalog = self.catalog
+        with catalog.lock:
+            if "since" not in query:
+                self.send(200, {"version": catalog.version})
+                return
+            changes = catalog.changes_since(int(query["since"]))
+        if changes is None:
+            self.send(410, {"detail": "Version too old; resync"})
+        else:
+            self.send(200, changes)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, catalog: Catalog, port: int = 0, latency_ms: float = 0):
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+        handler = type("Handler", (StubHandler,), {
+            "catalog": catalog, "latency": latency_ms / 1000, "stats": self._stats, "stats_lock": self._stats_lock,
+        })
+        super().__init__(("127.0.0.1", port), handler)
+        self.catalog = catalog
+        self.reset_stats()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/"
+
+    @property
+    def stats(self) -> dict:
+        # A consistent copy: requests are counted concurrently
+        with self._stats_lock:
+            return dict(self._stats, by_endpoint=dict(self._stats["by_endpoint"]))
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats.clear()
+            self._stats.update(requests=0, bytes_in=0, bytes_out=0, by_endpoint=Counter())
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Chords API.")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0, help="added delay per response, in ms")
+    parser.add_argument("--artists", type=int, default=DEFAULT_ARTISTS)
+    parser.add_argument("--songs", type=int, default=DEFAULT_SONGS)
+    parser.add_argument("--lyrics-size", type=int, default=DEFAULT_LYRICS_SIZE, help="characters per song")
+    args = parser.parse_args()
+
+    server = StubServer(Catalog(args.artists, args.songs, args.lyrics_size), args.port, args.latency)
+    print(f"Stub Chords API on {server.url} ({args.songs} songs, {args.latency} ms latency)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import itertools
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+MAX_WORKERS = 4
+
+
+class WorkerSignals(QObject):
+    item = Signal(int, object)
+    finished = Signal(int, object)
+    failed = Signal(int, object)
+
+
+class ApiWorker(QRunnable):
+    def __init__(self, request_id: int, fn, args, kwargs):
+        super().__init__()
+        self.request_id = request_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.cancelled = False
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, e)
+            return
+        self.signals.finished.emit(self.request_id, result)
+
+
+class StreamWorker(ApiWorker):
+    # Runs a generator function, emitting every yielded chunk (e.g. a page of songs)
+    def run(self):
+        try:
+            chunks = self.fn(*self.args, **self.kwargs)
+            try:
+                for chunk in chunks:
+                    if self.cancelled:
+                        break  # superseded: stop pulling further pages
+                    self.signals.item.emit(self.request_id, chunk)
+            finally:
+                chunks.close()  # lets the generator release files/connections right away
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, e)
+            return
+        self.signals.finished.emit(self.request_id, None)
+
+
+class PendingRequest:
+    __slots__ = ("kind", "worker", "on_result", "on_error", "on_item")
+
+    def __init__(self, kind, worker, on_result, on_error, on_item=None):
+        self.kind = kind
+        self.worker = worker
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_item = on_item
+
+
+class RequestExecutor(QObject):
+    """Runs blocking api_calls functions on a thread pool.
+
+    Every request has a ``kind``. When a newer request of the same kind is
+    submitted, the older one is cancelled: a queued request is taken off the
+    pool, a streamed one stops after its current chunk, and any result still
+    arriving from it is dropped. So only the latest songs list / search /
+    song load ever reaches the UI. Requests submitted with ``kind=None``
+    (mutations) are never superseded. Callbacks always run on the GUI thread.
+    """
+
+    busy_changed = Signal(str, bool)
+
+    def __init__(self, parent=None, max_workers: int = MAX_WORKERS):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self._ids = itertools.count(1)
+        self._pending = {}  # request id -> PendingRequest
+        self._latest = {}  # kind -> newest request id
+        self._in_flight = {}  # kind -> number of running requests
+
+    def submit(self, kind, fn, *args, on_result=None, on_error=None, **kwargs) -> int:
+        request_id = next(self._ids)
+        worker = ApiWorker(request_id, fn, args, kwargs)
+        self._start(PendingRequest(kind, worker, on_result, on_error))
+        return request_id
+
+    def submit_stream(self, kind, fn, *args, on_item=None, on_result=None, on_error=None, **kwargs) -> int:
+        # fn is a generator function; on_item gets every chunk, on_result(None) runs at the end
+        request_id = next(self._ids)
+        worker = StreamWorker(request_id, fn, args, kwargs)
+        self._start(PendingRequest(kind, worker, on_result, on_error, on_item))
+        return request_id
+
+    def is_busy(self, kind: str) -> bool:
+        return self._in_flight.get(kind, 0) > 0
+
+    def is_idle(self) -> bool:
+        # Nothing queued or running, of any kind (mutations included)
+        return not self._pending
+
+    def cancel(self, kind: str):
+        self._supersede(kind)
+        self._latest.pop(kind, None)
+
+    def _start(self, request: PendingRequest):
+        worker = request.worker
+        worker.setAutoDelete(False)
+        worker.signals.item.connect(self._on_item)
+        worker.signals.finished.connect(self._on_finished)
+        worker.signals.failed.connect(self._on_failed)
+
+        kind = request.kind
+        if kind is not None:
+            self._supersede(kind)
+            self._latest[kind] = worker.request_id
+            self._in_flight[kind] = self._in_flight.get(kind, 0) + 1
+            if self._in_flight[kind] == 1:
+                self.busy_changed.emit(kind, True)
+
+        self._pending[worker.request_id] = request
+        self.pool.start(worker)
+
+    def _supersede(self, kind: str):
+        previous = self._pending.get(self._latest.get(kind))
+        if previous is None:
+            return
+        previous.worker.cancelled = True
+        if self.pool.tryTake(previous.worker):
+            self._complete(previous.worker.request_id)  # never started
+
+    def _complete(self, request_id: int):
+        request = self._pending.pop(request_id, None)
+        if request is None:
+            return None
+        kind = request.kind
+        if kind is None:
+            return request
+
+        self._in_flight[kind] -= 1
+        if not self._in_flight[kind]:
+            self.busy_changed.emit(kind, False)
+
+        if self._latest.get(kind) != request_id:
+            return None  # superseded by a newer request of the same kind
+        return request
+
+    @Slot(int, object)
+    def _on_item(self, request_id: int, chunk):
+        request = self._pending.get(request_id)
+        if request is None or request.worker.cancelled:
+            return
+        if request.on_item:
+            request.on_item(chunk)
+
+    @Slot(int, object)
+    def _on_finished(self, request_id: int, result):
+        request = self._complete(request_id)
+        if request and request.on_result:
+            request.on_result(result)
+
+    @Slot(int, object)
+    def _on_failed(self, request_id: int, error):
+        request = self._complete(request_id)
+        if request and request.on_error:
+            request.on_error(error)